@@ -0,0 +1,64 @@
+"""Write throughput of a bare SQLite engine versus each tuned profile.
+
+Every write is its own transaction, the way the model layer commits once
+per create/move/delete.
+
+    poetry run python benchmarks/db_profiles.py [--writes N]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import Engine, insert
+from sqlmodel import SQLModel, create_engine
+
+from systema.management import DBProfile
+from systema.models.project import Project
+from systema.models.task import Task
+from systema.server.db import engine_factory
+
+
+def run(engine: Engine, writes: int):
+    SQLModel.metadata.create_all(engine, tables=[Project.__table__, Task.__table__])  # type: ignore
+    with engine.begin() as connection:
+        connection.execute(insert(Project).values(id="p" * 21, name="benchmark"))
+
+    start = time.perf_counter()
+    for i in range(writes):
+        with engine.begin() as connection:
+            connection.execute(
+                insert(Task).values(
+                    id=f"{i:021}", name=f"task {i}", project_id="p" * 21
+                )
+            )
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+    return writes / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writes", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engines: dict[str, Engine] = {
+            "default": create_engine(f"sqlite:///{Path(directory) / 'default.db'}")
+        }
+        for profile in DBProfile:
+            address = f"sqlite:///{Path(directory) / profile.value}.db"
+            engines[profile.value] = engine_factory(address, profile)
+
+        baseline = None
+        for name, engine in engines.items():
+            throughput = run(engine, args.writes)
+            baseline = baseline or throughput
+            print(
+                f"{name:>12}: {throughput:10.0f} writes/s ({throughput / baseline:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Cost of building read models from database rows, validated versus trusted.
+
+    poetry run python benchmarks/read_models.py [--rows N]
+"""
+
+import argparse
+import time
+
+from systema.models.bin import Bin, BinRead
+from systema.models.card import Card, CardRead
+from systema.models.item import Item, ItemRead
+from systema.models.task import Task
+
+
+def measure(label: str, build, rows: list[tuple]):
+    start = time.perf_counter()
+    for row in rows:
+        build(*row)
+    elapsed = time.perf_counter() - start
+    print(f"{label:>24}: {elapsed * 1000:8.1f} ms ({len(rows) / elapsed:10.0f} rows/s)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    tasks = [Task(name=f"task {i}", project_id="p" * 21) for i in range(args.rows)]
+    cards = [(Card(id=t.id, order=i), t) for i, t in enumerate(tasks)]
+    items = [(Item(id=t.id, order=i), t) for i, t in enumerate(tasks)]
+    bins = [
+        (Bin(name=f"bin {i}", board_id="p" * 21, order=i),) for i in range(args.rows)
+    ]
+
+    for read_model, rows in ((CardRead, cards), (ItemRead, items)):
+        name = read_model.__name__
+        validated = measure(
+            f"{name} validated",
+            lambda obj, task: read_model.model_validate(obj, update=task.model_dump()),
+            rows,
+        )
+        trusted = measure(f"{name} trusted", read_model.from_task, rows)
+        print(f"{'speedup':>24}: {validated / trusted:.1f}x")
+
+    validated = measure("BinRead validated", BinRead.model_validate, bins)
+    trusted = measure("BinRead trusted", BinRead.from_bin, bins)
+    print(f"{'speedup':>24}: {validated / trusted:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Throughput of creating tasks (each with its item and card) one at a time.
+
+Also counts the flushes and SQL statements a single create costs.
+
+    poetry run python benchmarks/task_create.py [--creates N] [--existing N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--creates", type=int, default=1000)
+    parser.add_argument("--existing", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # The engine is built from settings on import
+        os.environ["SYSTEMA_DB_ADDRESS"] = f"sqlite:///{Path(directory) / 'tasks.db'}"
+
+        from sqlalchemy import event
+        from sqlalchemy.orm import Session
+
+        import systema.models.board  # noqa: F401
+        import systema.models.checklist  # noqa: F401
+        from systema.models.item import Item
+        from systema.models.project import Project, ProjectCreate
+        from systema.models.task import TaskCreate
+        from systema.server.db import create_db_and_tables, engine
+
+        create_db_and_tables()
+        project = Project.create(ProjectCreate(name="benchmark"))
+        for i in range(args.existing):
+            Item.create(TaskCreate(name=f"existing {i}"), project.id)
+
+        counts = {"flushes": 0, "statements": 0}
+
+        @event.listens_for(Session, "after_flush")
+        def count_flush(session, flush_context):
+            counts["flushes"] += 1
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count_statement(conn, cursor, statement, parameters, context, many):
+            counts["statements"] += 1
+
+        start = time.perf_counter()
+        for i in range(args.creates):
+            Item.create(TaskCreate(name=f"task {i}"), project.id)
+        elapsed = time.perf_counter() - start
+        engine.dispose()
+
+    print(f"{'creates/s':>18}: {args.creates / elapsed:10.0f}")
+    for name, count in counts.items():
+        print(f"{name + ' / create':>18}: {count / args.creates:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
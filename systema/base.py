@@ -1,7 +1,11 @@
 from __future__ import annotations
 
-from typing import ClassVar
+from functools import cache
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, ClassVar, Self, Sequence
 
+from sqlalchemy import Select
+from sqlalchemy import select as sa_select
 from sqlmodel import Field
 from sqlmodel import SQLModel as _SQLModel
 
@@ -16,6 +20,9 @@ class BaseModel(_SQLModel):
     class NotFound(Exception):
         """When query returns no result"""
 
+    class UnknownField(ValueError):
+        """When a requested field is not part of the model"""
+
     @classmethod
     def get_singular_name(cls):
         return cls.__name__
@@ -26,6 +33,71 @@ class BaseModel(_SQLModel):
             return plural
         return cls.get_singular_name() + "s"
 
+    @classmethod
+    def from_rows(cls, *rows: Any) -> Self:
+        """Build without validation from rows whose values are already valid.
+
+        Each field is read from the first row that has it. Equivalent to
+        `model_construct` with every field set, minus its per-field overhead.
+        """
+        values = {}
+        for row, (names, get_item, get_attr) in zip(
+            rows, cls._field_getters(*map(type, rows))
+        ):
+            try:
+                values.update(zip(names, get_item(row.__dict__)))
+            except KeyError:
+                # expired or deferred column, let the ORM load it
+                values.update(zip(names, get_attr(row)))
+
+        obj = cls.__new__(cls)
+        obj.__dict__.update(values)
+        obj.__pydantic_fields_set__.update(values)
+        return obj
+
+    @classmethod
+    def select_fields(
+        cls, fields: Sequence[str], *tables: type[_SQLModel]
+    ) -> tuple[Select, Callable[[Any], dict[str, Any]]]:
+        """Statement reading only `fields` from `tables`, and a builder of its rows.
+
+        Each field is read from the first table that has it, as in
+        `from_rows`. Rows are built into plain dicts keyed by field.
+        """
+        columns = []
+        for name in fields:
+            table = next((t for t in tables if name in t.model_fields), None)
+            if name not in cls.model_fields or table is None:
+                raise cls.UnknownField(f"Unknown field: {name}")
+            columns.append(getattr(table, name))
+
+        statement = sa_select(*columns).select_from(tables[0])
+        return statement, lambda row: dict(zip(fields, row))
+
+    @classmethod
+    @cache
+    def _field_getters(cls, *row_types: type[_SQLModel]):
+        getters = []
+        for i, row_type in enumerate(row_types):
+            names = tuple(
+                name
+                for name in cls.model_fields
+                if name in row_type.model_fields
+                and not any(name in t.model_fields for t in row_types[:i])
+            )
+            getters.append((names, *_tuple_getters(names)))
+        return tuple(getters)
+
+
+def _tuple_getters(names: tuple[str, ...]):
+    """Item and attribute getters that always return a tuple of `names`"""
+    if not names:
+        return (lambda _: ()), (lambda _: ())
+    if len(names) == 1:
+        name = names[0]
+        return (lambda d: (d[name],)), (lambda o: (getattr(o, name),))
+    return itemgetter(*names), attrgetter(*names)
+
 
 class IdMixin(_SQLModel):
     id: str = Field(
@@ -2,7 +2,14 @@ import typer
 from rich import print
 
 from systema.__version__ import VERSION
-from systema.cli.migration import create_submodels
+from systema.cli.migration import (
+    add_columns,
+    backfill_project_ids,
+    create_indexes,
+    create_submodels,
+    delete_orphans,
+    drop_stale_indexes,
+)
 from systema.management import (
     DB_FILENAME,
     DOTENV_FILENAME,
@@ -95,6 +102,24 @@ def prompt_for_superuser():
     print(f"Superuser {username} created")
 
 
+@app.command()
+def upgrade():
+    """Upgrade database schema"""
+
+    create_db_and_tables()
+    add_columns()
+    backfill_project_ids()
+    drop_stale_indexes()
+    create_indexes()
+
+
+@app.command()
+def orphans():
+    """Delete rows left behind by deleted projects and tasks"""
+
+    delete_orphans()
+
+
 @app.command(help="Create superuser")
 def superuser():
     """Create superuser"""
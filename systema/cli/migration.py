@@ -1,11 +1,15 @@
-from sqlmodel import Session, select
+from sqlalchemy import inspect
+from sqlalchemy.schema import CreateColumn
+from sqlmodel import Session, SQLModel, col, delete, select, text, update
 
+from systema.models.bin import Bin
 from systema.models.board import Board
 from systema.models.card import Card
+from systema.models.change import Tombstone
 from systema.models.checklist import Checklist
 from systema.models.item import Item
 from systema.models.project import Project, SubProjectMixin
-from systema.models.task import SubTaskMixin, Task
+from systema.models.task import SubTaskMixin, Task, TaskMixin
 from systema.server.db import engine
 
 CoreModels = Project | Task
@@ -26,9 +30,133 @@ def create_submodels():
             print(f"Iterating through {core_model.__name__}")
             for core_instance in session.exec(select(core_model)).all():
                 for submodel in submodels:
+                    if _is_unused_view(session, submodel, core_instance):
+                        continue
                     if not session.get(submodel, core_instance.id):
                         print(
                             f"Instance of {submodel.__name__} not found for id={core_instance.id}"
                         )
-                        session.add(submodel(id=core_instance.id))
+                        session.add(submodel.model_validate(core_instance))
                         session.commit()
+
+
+def _is_unused_view(session: Session, submodel: type[SubModels], instance: CoreModels):
+    """Whether `submodel` is a task view its project has not materialized yet.
+
+    Such views get a row for every task the first time they are used.
+    """
+    if not issubclass(submodel, TaskMixin):
+        return False
+    try:
+        return not submodel.is_materialized(session, instance.project_id)
+    except Project.NotFound:
+        return False
+
+
+def add_columns():
+    inspector = inspect(engine)
+    existing_tables = inspector.get_table_names()
+    with engine.begin() as connection:
+        for table in SQLModel.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                print(f"Adding column {column.name} to {table.name}")
+                definition = CreateColumn(column).compile(dialect=engine.dialect)
+                connection.execute(
+                    text(f"ALTER TABLE {table.name} ADD COLUMN {definition}")
+                )
+
+
+def backfill_project_ids():
+    with Session(engine) as session:
+        for model in (Item, Card):
+            statement = (
+                update(model)
+                .where(col(model.project_id).is_(None))
+                .values(
+                    project_id=select(Task.project_id)
+                    .where(Task.id == model.id)
+                    .scalar_subquery()
+                )
+            )
+            result = session.exec(statement)  # type: ignore
+            print(
+                f"Filled project_id of {result.rowcount} rows of {model.__tablename__}"
+            )
+        session.commit()
+
+
+def drop_stale_indexes():
+    inspector = inspect(engine)
+    existing_tables = inspector.get_table_names()
+    with engine.begin() as connection:
+        for table in SQLModel.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            wanted = {index.name for index in table.indexes}
+            for index in inspector.get_indexes(table.name):
+                name = index["name"]
+                if name and name.startswith("ix_") and name not in wanted:
+                    print(f"Dropping index {name} on {table.name}")
+                    connection.execute(text(f"DROP INDEX {name}"))
+
+
+def create_indexes():
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            print(f"Ensuring index {index.name} on {table.name}")
+            index.create(engine, checkfirst=True)
+
+
+def delete_orphans():
+    project_ids = select(Project.id)
+    task_ids = select(Task.id)
+    board_ids = select(Board.id)
+    statements = (
+        delete(Task).where(col(Task.project_id).not_in(project_ids)),
+        delete(Item).where(col(Item.id).not_in(task_ids)),
+        delete(Card).where(col(Card.id).not_in(task_ids)),
+        delete(Checklist).where(col(Checklist.id).not_in(project_ids)),
+        delete(Board).where(col(Board.id).not_in(project_ids)),
+        delete(Bin).where(col(Bin.board_id).not_in(board_ids)),
+        delete(Tombstone).where(col(Tombstone.project_id).not_in(project_ids)),
+    )
+
+    with Session(engine) as session:
+        stamps = _tombstone_leaked_views(session)
+        for statement in statements:
+            result = session.exec(statement)  # type: ignore
+            print(f"Deleted {result.rowcount} orphan rows from {statement.table}")
+        for project_id, stamp in stamps.items():
+            Task.close_gaps(session, project_id, stamp)
+        session.commit()
+
+
+def _tombstone_leaked_views(session: Session):
+    """Tombstone items and cards whose task is gone but whose project is not.
+
+    Returns the version stamp of each project touched.
+    """
+    stamps: dict[str, dict[str, int]] = {}
+    for model in (Item, Card):
+        statement = select(model.project_id, model.id).where(
+            col(model.id).not_in(select(Task.id)),
+            col(model.project_id).in_(select(Project.id)),
+        )
+        for project_id, id in session.exec(statement).all():
+            if project_id not in stamps:
+                stamps[project_id] = {
+                    "version": Project.bump_version(session, project_id)
+                }
+            tombstone = Tombstone(
+                project_id=project_id,
+                table_name=model.__tablename__,
+                id=id,
+                **stamps[project_id],
+            )
+            session.merge(tombstone)
+    return stamps
@@ -16,6 +16,12 @@ class InstanceType(enum.StrEnum):
     CLIENT = "client"
 
 
+class DBProfile(enum.StrEnum):
+    SERVER = "server"
+    TUI = "tui"
+    LOW_MEMORY = "low-memory"
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_prefix="systema_",
@@ -28,6 +34,12 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = Field(default=30)
     base_path: DirectoryPath = Field(default=str(BASE_DIR))
     db_address: str = Field(default=f"sqlite:///{BASE_DIR}/{DB_FILENAME}")
+    db_profile: DBProfile = Field(default=DBProfile.SERVER)
+    db_instrumentation: bool = Field(default=False)
+    read_cache_max_entries: int = Field(default=256)
+    read_cache_ttl: float = Field(default=5.0)
+    token_cache_max_entries: int = Field(default=1024)
+    token_cache_ttl: float = Field(default=60.0)
     nanoid_alphabet: str = Field(default=alphabet)
     nanoid_size: int = Field(default=size)
     server_base_url: AnyHttpUrl = Field(default="http://0.0.0.0:8080/")
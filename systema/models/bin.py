@@ -1,10 +1,12 @@
 from datetime import datetime
-from typing import Literal
+from typing import Literal, Sequence
 
-from sqlmodel import Field, Session, col, select
+from sqlmodel import Field, Index, Session, col, select, update
 
 from systema.base import BaseModel, IdMixin
-from systema.server.db import engine
+from systema.models.change import VersionMixin, version_values
+from systema.models.project import CollectionMixin, Project
+from systema.server.db import engine, unit_of_work
 
 
 class BinBase(BaseModel):
@@ -21,7 +23,12 @@ class BinUpdate(BaseModel):
     order: int | None = None
 
 
-class Bin(BinBase, IdMixin, table=True):
+class Bin(BinBase, VersionMixin, IdMixin, CollectionMixin["BinRead"], table=True):
+    __table_args__ = (
+        Index("ix_bin_board_id_order", "board_id", "order"),
+        Index("ix_bin_board_id_version", "board_id", "version"),
+    )
+
     board_id: str = Field(..., foreign_key="board.id")
     created_at: datetime = Field(default_factory=datetime.now, index=True)
 
@@ -41,77 +48,61 @@ class Bin(BinBase, IdMixin, table=True):
         raise Board.NotFound
 
     @classmethod
-    def get(cls, board_id: str, id: str):
+    def get(cls, board_id: str, id: str, fields: Sequence[str] | None = None):
         with Session(engine) as session:
-            return BinRead.from_bin(cls._get(session, board_id, id))
+            if fields is None:
+                return BinRead.from_bin(cls._get(session, board_id, id))
+            statement, build = cls._select(fields)
+            statement = statement.where(Bin.id == id, Bin.board_id == board_id)
+            if row := session.exec(statement).first():
+                return build(row)
+            raise Bin.NotFound()
 
     @classmethod
     def create(cls, data: BinCreate, board_id: str):
-        with Session(engine) as session:
+        with unit_of_work() as session:
             project = cls._get_board(session, board_id)
+            Project.bump_version(session, project.id)
             bin = Bin(name=data.name, board_id=project.id, order=data.order)
             session.add(bin)
-            session.commit()
-            session.refresh(bin)
             cls._reorder(session, bin.board_id, bin.order, exclude=bin.id, shift=True)
-            session.refresh(bin)
             return BinRead.from_bin(bin)
 
     @classmethod
     def move(
         cls, project_id: str, id: str, direction: Literal["right"] | Literal["left"]
     ):
-        with Session(engine) as session:
+        with unit_of_work() as session:
             project = cls._get_board(session, project_id)
+            Project.bump_version(session, project.id)
             bin = cls._get(session, project_id, id)
 
-            original_order = bin.order
-
+            statement = select(Bin).where(Bin.board_id == project.id, Bin.id != bin.id)
             if direction == "left":
-                bin.order = max(0, bin.order - 1)
+                statement = statement.where(Bin.order < bin.order).order_by(
+                    col(Bin.order).desc()
+                )
             elif direction == "right":
-                statement = (
-                    select(Bin)
-                    .where(Bin.board_id == project_id)
-                    .order_by(col(Bin.order).desc())
+                statement = statement.where(Bin.order > bin.order).order_by(
+                    col(Bin.order).asc()
                 )
-                max_bin = session.exec(statement).first()
-                max_order = max_bin.order if max_bin else 0
-                if bin.order >= max_order:
-                    return bin
-
-                bin.order += 1
             else:
                 raise ValueError()
 
-            session.add(bin)
-            session.commit()
-            session.refresh(bin)
-
-            cls._reorder(
-                session,
-                project.id,
-                original_order,
-                exclude=bin.id,
-                shift=False,
-            )
-            cls._reorder(
-                session,
-                project.id,
-                bin.order,
-                exclude=bin.id,
-                shift=True,
-            )
+            neighbour = session.exec(statement).first()
+            if neighbour is None:
+                return BinRead.from_bin(bin)
 
-            session.add(bin)
-            session.commit()
-            session.refresh(bin)
-            return bin
+            bin.order, neighbour.order = neighbour.order, bin.order
+
+            session.add_all((bin, neighbour))
+            return BinRead.from_bin(bin)
 
     @classmethod
     def update(cls, board_id: str, id: str, data: BinUpdate):
-        with Session(engine) as session:
+        with unit_of_work() as session:
             board = cls._get_board(session, board_id)
+            Project.bump_version(session, board.id)
             bin = cls._get(session, board_id, id)
 
             original_order = bin.order
@@ -119,9 +110,6 @@ class Bin(BinBase, IdMixin, table=True):
             bin.sqlmodel_update(data.model_dump(exclude_unset=True))
 
             session.add(bin)
-            session.commit()
-
-            session.refresh(bin)
 
             if original_order != bin.order:
                 cls._reorder(
@@ -139,36 +127,32 @@ class Bin(BinBase, IdMixin, table=True):
                     shift=True,
                 )
 
-            session.refresh(bin)
-
             return BinRead.from_bin(bin)
 
     @classmethod
     def delete(cls, board_id: str, id: str):
-        with Session(engine) as session:
+        with unit_of_work() as session:
             board = cls._get_board(session, board_id)
+            Project.bump_version(session, board.id)
             bin = cls._get(session, board.id, id)
 
             cls._reorder(session, board_id, bin.order, bin.id, shift=False)
 
             session.delete(bin)
 
-            session.commit()
+    @classmethod
+    def _sort_columns(cls):
+        return (col(Bin.order), col(Bin.id))
 
     @classmethod
-    def list(cls, board_id: str):
-        with Session(engine) as session:
-            board = cls._get_board(session, board_id)
-            statement = (
-                select(Bin)
-                .where(
-                    Bin.board_id == board.id,
-                )
-                .order_by(
-                    col(Bin.order).asc(),
-                )
-            )
-            return (BinRead.from_bin(row) for row in session.exec(statement).all())
+    def _select(cls, fields: Sequence[str] | None = None):
+        if fields is None:
+            return select(Bin), BinRead.from_bin
+        return BinRead.select_fields(fields, Bin)
+
+    @classmethod
+    def _in_project(cls, project_id: str):
+        return Bin.board_id == project_id
 
     @classmethod
     def _reorder(
@@ -179,22 +163,21 @@ class Bin(BinBase, IdMixin, table=True):
         exclude: str,
         shift: bool = True,
     ):
+        if shift:
+            criteria, offset = Bin.order >= order, 1
+        else:
+            criteria, offset = Bin.order > order, -1
         statement = (
-            select(Bin)
+            update(Bin)
             .where(
-                Bin.board_id == board_id,
-                Bin.order >= order,
-                Bin.id != exclude,
+                col(Bin.board_id) == board_id,
+                criteria,
+                col(Bin.id) != exclude,
             )
-            .order_by(col(Bin.order).asc())
+            .values(order=Bin.order + offset, **version_values(session))
+            .execution_options(synchronize_session=False)
         )
-        bins = session.exec(statement).all()
-        for i, bin in enumerate(bins):
-            bin.order = order + i
-            if shift:
-                bin.order += 1
-            session.add(bin)
-        session.commit()
+        session.exec(statement)  # type: ignore
 
 
 class BinRead(BinBase):
@@ -204,4 +187,4 @@ class BinRead(BinBase):
 
     @classmethod
     def from_bin(cls, bin: Bin):
-        return BinRead.model_validate(bin)
+        return BinRead.from_rows(bin)
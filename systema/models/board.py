@@ -1,14 +1,51 @@
+from __future__ import annotations
+
 from sqlmodel import Session
 
-from systema.models.project import SubProjectMixin
+from systema.base import BaseModel
+from systema.models.bin import Bin, BinRead
+from systema.models.card import Card, CardRead
+from systema.models.project import Project, SubProjectMixin
 
 
 class Board(SubProjectMixin, table=True):
     def create_default_bins(self, session: Session):
-        from systema.models.bin import Bin
-
         todo = Bin(board_id=self.id, name="TO DO", order=0)
         in_progress = Bin(board_id=self.id, name="IN PROGRESS", order=1)
         done = Bin(board_id=self.id, name="DONE", order=2)
         session.add_all((todo, in_progress, done))
-        session.commit()
+
+    @classmethod
+    def snapshot(cls, id: str, version: int | None = None) -> BoardSnapshot:
+        """Bins of the board in order, each holding its cards in order.
+
+        Built from the bin and card lists at the project `version`, so it costs
+        at most their two queries (none when both are cached).
+        """
+        if version is None:
+            version = Project.get_version(id)
+        bins = {
+            bin.id: BinSnapshot.model_construct(**bin.__dict__, cards=[])
+            for bin in Bin.list(id, version=version)
+        }
+        cards = []
+        for card in Card.list(id, version=version):
+            if card.bin_id is None:
+                cards.append(card)
+            elif bin := bins.get(card.bin_id):
+                bin.cards.append(card)
+
+        return BoardSnapshot.model_construct(
+            id=id, cards=cards, bins=list(bins.values())
+        )
+
+
+class BinSnapshot(BinRead):
+    cards: list[CardRead]
+
+
+class BoardSnapshot(BaseModel):
+    id: str
+    cards: list[CardRead]
+    """Cards not in any bin"""
+    bins: list[BinSnapshot]
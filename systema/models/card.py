@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from typing import Literal
+from typing import Literal, Self
 
-from sqlmodel import Field, Session, col, select
+from sqlmodel import Field, Index, Session, case, col, func, select, update
 
 from systema.base import BaseModel
 from systema.models.bin import Bin
+from systema.models.change import VersionMixin, version_values
 from systema.models.project import Project
 from systema.models.task import (
     SubTaskMixin,
@@ -15,7 +16,7 @@ from systema.models.task import (
     TaskRead,
     TaskUpdate,
 )
-from systema.server.db import engine
+from systema.server.db import unit_of_work
 
 
 class CardBase(BaseModel):
@@ -35,18 +36,29 @@ class CardUpdate(CardBase, TaskUpdate):
     pass
 
 
-class Card(SubTaskMixin, CardBase, TaskMixin[CardRead], table=True):
+class CardPosition(CardBase):
+    pass
+
+
+class Card(SubTaskMixin, CardBase, VersionMixin, TaskMixin[CardRead], table=True):
+    __table_args__ = (
+        Index("ix_card_project_id_bin_id_order", "project_id", "bin_id", "order"),
+    )
+
     @staticmethod
     def get_read_model():
         return CardRead
 
+    @staticmethod
+    def get_view_model():
+        from systema.models.board import Board
+
+        return Board
+
     @classmethod
     def _create(cls, session: Session, task: Task):
-        session.refresh(task)
         card = Card.model_validate(task)
         session.add(card)
-        session.commit()
-        session.refresh(card)
 
         cls._reorder(
             session,
@@ -56,10 +68,25 @@ class Card(SubTaskMixin, CardBase, TaskMixin[CardRead], table=True):
             exclude=card.id,
             shift=True,
         )
-
-        session.refresh(card)
         return card
 
+    @classmethod
+    def pre_delete(
+        cls,
+        session: Session,
+        project: Project,
+        original_obj: Self,
+    ):
+        cls._reorder(
+            session,
+            project.id,
+            original_obj.bin_id,
+            original_obj.order,
+            exclude=original_obj.id,
+            shift=False,
+        )
+        return True
+
     @classmethod
     def _reorder(
         cls,
@@ -70,25 +97,22 @@ class Card(SubTaskMixin, CardBase, TaskMixin[CardRead], table=True):
         exclude: str,
         shift: bool = True,
     ):
+        if shift:
+            criteria, offset = cls.order >= order, 1
+        else:
+            criteria, offset = cls.order > order, -1
         statement = (
-            select(cls)
-            .join(Task)
+            update(cls)
             .where(
-                Task.id == cls.id,
-                Task.project_id == project_id,
-                cls.bin_id == bin_id,
-                cls.order >= order,
-                cls.id != exclude,
+                cls.project_id == project_id,
+                col(cls.bin_id) == bin_id,
+                criteria,
+                col(cls.id) != exclude,
             )
-            .order_by(col(cls.order).asc())
+            .values(order=cls.order + offset, **version_values(session))
+            .execution_options(synchronize_session=False)
         )
-        cards = session.exec(statement).all()
-        for i, item in enumerate(cards):
-            item.order = order + i
-            if shift:
-                item.order += 1
-            session.add(item)
-        session.commit()
+        session.exec(statement)  # type: ignore
 
     @classmethod
     def move(
@@ -97,49 +121,65 @@ class Card(SubTaskMixin, CardBase, TaskMixin[CardRead], table=True):
         id: str,
         direction: Literal["up"] | Literal["down"] | Literal["left"] | Literal["right"],
     ):
-        with Session(engine) as session:
+        with unit_of_work() as session:
             project = cls.get_project(session, project_id)
+            Project.bump_version(session, project.id)
+            cls.materialize(session, project.id)
             card, task = cls.get_task(session, project, id)
 
-            original_card = card.model_copy()
-
-            if direction == "up":
-                card.order = max(0, card.order - 1)
-            elif direction == "down":
-                statement = (
-                    select(Card)
-                    .join(Task)
-                    .where(
-                        Card.bin_id == card.bin_id,
-                        Card.id == Task.id,
-                        Task.project_id == project_id,
-                    )
-                    .order_by(col(Card.order).desc())
-                )
-                max_card = session.exec(statement).first()
-                max_order = max_card.order if max_card else 0
-
-                if card.order >= max_order:
-                    return CardRead.from_task(card, task)
-
-                card.order += 1
+            if direction in ("up", "down"):
+                cls._move_y(session, card, project, direction)
             elif direction in ("left", "right"):
+                original_card = card.model_copy()
                 cls._move_x(session, card, project, direction)
+
+                session.add(card)
+
+                if original_card.bin_id != card.bin_id:
+                    cls._reorder(
+                        session,
+                        project.id,
+                        original_card.bin_id,
+                        original_card.order,
+                        exclude=card.id,
+                        shift=False,
+                    )
             else:
                 raise ValueError()
 
-            session.add(card)
-            session.commit()
-            session.refresh(card)
+            return CardRead.from_task(card, task)
+
+    @classmethod
+    def move_to(cls, project_id: str, id: str, bin_id: str | None, order: int):
+        with unit_of_work() as session:
+            project = cls.get_project(session, project_id)
+            Project.bump_version(session, project.id)
+            cls.materialize(session, project.id)
+            card, task = cls.get_task(session, project, id)
+            if bin_id is not None:
+                Bin._get(session, project.id, bin_id)
 
             cls._reorder(
                 session,
                 project.id,
-                original_card.bin_id,
-                original_card.order,
+                card.bin_id,
+                card.order,
                 exclude=card.id,
                 shift=False,
             )
+
+            statement = (
+                select(func.count())
+                .select_from(Card)
+                .where(
+                    Card.project_id == project.id,
+                    Card.bin_id == bin_id,
+                    Card.id != card.id,
+                )
+            )
+            card.bin_id = bin_id
+            card.order = min(order, session.exec(statement).one())
+
             cls._reorder(
                 session,
                 project.id,
@@ -150,11 +190,69 @@ class Card(SubTaskMixin, CardBase, TaskMixin[CardRead], table=True):
             )
 
             session.add(card)
-            session.commit()
-            session.refresh(card)
-            session.refresh(task)
             return CardRead.from_task(card, task)
 
+    @classmethod
+    def set_order(cls, project_id: str, bin_id: str | None, ids: list[str]):
+        with unit_of_work() as session:
+            project = cls.get_project(session, project_id)
+            Project.bump_version(session, project.id)
+            cls.materialize(session, project.id)
+            if bin_id is not None:
+                Bin._get(session, project.id, bin_id)
+
+            statement = select(Card.id).where(
+                Card.project_id == project.id,
+                Card.bin_id == bin_id,
+            )
+            if len(ids) != len(set(ids)) or set(ids) != set(session.exec(statement)):
+                raise ValueError("Ordering must list every card of the bin once")
+            if not ids:
+                return
+
+            statement = (
+                update(Card)
+                .where(col(Card.id).in_(ids))
+                .values(
+                    order=case({id: i for i, id in enumerate(ids)}, value=Card.id),
+                    **version_values(session),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            session.exec(statement)  # type: ignore
+
+    @classmethod
+    def _move_y(
+        cls,
+        session: Session,
+        card: Card,
+        project: Project,
+        direction: Literal["up"] | Literal["down"],
+    ):
+        statement = select(Card).where(
+            Card.project_id == project.id,
+            Card.bin_id == card.bin_id,
+            Card.id != card.id,
+        )
+        if direction == "up":
+            statement = statement.where(Card.order < card.order).order_by(
+                col(Card.order).desc()
+            )
+        elif direction == "down":
+            statement = statement.where(Card.order > card.order).order_by(
+                col(Card.order).asc()
+            )
+        else:
+            raise ValueError
+
+        neighbour = session.exec(statement).first()
+        if neighbour is None:
+            return
+
+        card.order, neighbour.order = neighbour.order, card.order
+
+        session.add_all((card, neighbour))
+
     @classmethod
     def _move_x(
         cls,
@@ -174,20 +272,19 @@ class Card(SubTaskMixin, CardBase, TaskMixin[CardRead], table=True):
 
         if target_order == -1:
             card.bin_id = None
-            card.order = 0
-            return
+        else:
+            target_bin = session.exec(
+                select(Bin).where(
+                    Bin.board_id == project.id,
+                    Bin.order == target_order,
+                )
+            ).first()
 
-        target_bin = session.exec(
-            select(Bin).where(
-                Bin.board_id == project.id,
-                Bin.order == target_order,
-            )
-        ).first()
+            if target_bin is None:
+                return
 
-        if target_bin is None:
-            return
+            card.bin_id = target_bin.id
 
-        card.bin_id = target_bin.id
         card.order = 0
 
         cls._reorder(
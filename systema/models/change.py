@@ -0,0 +1,67 @@
+from itertools import chain
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlmodel import Field, Index
+
+from systema.base import BaseModel
+
+PROJECT_VERSION = "project_version"
+"""Session info key holding the project id and version being written"""
+
+
+class VersionMixin(BaseModel):
+    version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    """Project version of the last write to the row"""
+
+
+class Tombstone(BaseModel, table=True):
+    """Marks a row deleted at some project version"""
+
+    __table_args__ = (
+        Index("ix_tombstone_project_id_version", "project_id", "version"),
+    )
+
+    project_id: str = Field(..., foreign_key="project.id", primary_key=True)
+    table_name: str = Field(..., primary_key=True)
+    id: str = Field(..., primary_key=True)
+    version: int
+
+
+def version_values(session: Session) -> dict[str, int]:
+    """Values stamping rows changed by a bulk UPDATE with the version written"""
+    if change := session.info.get(PROJECT_VERSION):
+        _, version = change
+        return {"version": version}
+    return {}
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_versions(session: Session, flush_context, instances):
+    if (change := session.info.get(PROJECT_VERSION)) is None:
+        return
+
+    project_id, version = change
+    for obj in chain(session.new, session.dirty):
+        if isinstance(obj, VersionMixin):
+            obj.version = version
+    for obj in session.deleted:
+        if isinstance(obj, VersionMixin):
+            tombstone = Tombstone(
+                project_id=project_id,
+                table_name=obj.__tablename__,
+                id=obj.id,
+                version=version,
+            )
+            session.add(tombstone)
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_version(session: Session):
+    session.info.pop(PROJECT_VERSION, None)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_rolled_back_version(session: Session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop(PROJECT_VERSION, None)
@@ -2,9 +2,11 @@ from __future__ import annotations
 
 from typing import Literal, Self
 
-from sqlmodel import Field, Session, col, select
+from sqlmodel import Field, Index, Session, case, col, func, select, update
 
 from systema.base import BaseModel
+from systema.models.change import VersionMixin, version_values
+from systema.models.checklist import Checklist
 from systema.models.project import Project
 from systema.models.task import (
     Status,
@@ -14,8 +16,9 @@ from systema.models.task import (
     TaskMixin,
     TaskRead,
     TaskUpdate,
+    newest_first,
 )
-from systema.server.db import engine
+from systema.server.db import unit_of_work
 
 
 class ItemBase(BaseModel):
@@ -34,76 +37,143 @@ class ItemUpdate(ItemBase, TaskUpdate):
     pass
 
 
-class Item(SubTaskMixin, ItemBase, TaskMixin[ItemRead], table=True):
+class ItemPosition(ItemBase):
+    pass
+
+
+class Item(SubTaskMixin, ItemBase, VersionMixin, TaskMixin[ItemRead], table=True):
+    __table_args__ = (Index("ix_item_project_id_order", "project_id", "order"),)
+
     @staticmethod
     def get_read_model():
         return ItemRead
 
+    @staticmethod
+    def get_view_model():
+        return Checklist
+
+    @classmethod
+    def _default_order(cls):
+        unchecked = Task.status != Status.DONE
+        return case((unchecked, newest_first(partition_by=unchecked)), else_=0)
+
     @classmethod
     def _create(cls, session: Session, task: Task):
-        session.refresh(task)
         item = Item.model_validate(task)
         session.add(item)
-        session.commit()
-        session.refresh(item)
 
         cls._reorder(session, task.project_id, item.order, exclude=item.id, shift=True)
-
-        session.refresh(item)
         return item
 
     @classmethod
     def move(
         cls, project_id: str, id: str, up_or_down: Literal["up"] | Literal["down"]
     ):
-        with Session(engine) as session:
+        with unit_of_work() as session:
             project = cls.get_project(session, project_id)
+            Project.bump_version(session, project.id)
+            cls.materialize(session, project.id)
             item, task = cls.get_task(session, project, id)
 
-            original_order = item.order
-
+            if task.status == Status.DONE:
+                return ItemRead.from_task(item, task)
+
+            statement = (
+                select(Item)
+                .join(Task)
+                .where(
+                    Item.project_id == project.id,
+                    Task.status != Status.DONE,
+                    Item.id != item.id,
+                )
+            )
             if up_or_down == "up":
-                item.order = max(0, item.order - 1)
+                statement = statement.where(Item.order < item.order).order_by(
+                    col(Item.order).desc()
+                )
             elif up_or_down == "down":
-                statement = select(Item).order_by(col(Item.order).desc())
-                max_item = session.exec(statement).first()
-                max_order = max_item.order if max_item else 0
-                if item.order >= max_order:
-                    return ItemRead.from_task(item, task)
-
-                item.order += 1
+                statement = statement.where(Item.order > item.order).order_by(
+                    col(Item.order).asc()
+                )
             else:
                 raise ValueError()
 
-            session.add(item)
-            session.commit()
-            session.refresh(item)
+            neighbour = session.exec(statement).first()
+            if neighbour is None:
+                return ItemRead.from_task(item, task)
 
-            cls._reorder(
-                session,
-                project.id,
-                original_order,
-                exclude=item.id,
-                shift=False,
-            )
-            cls._reorder(
-                session,
-                project.id,
-                item.order,
-                exclude=item.id,
-                shift=True,
+            item.order, neighbour.order = neighbour.order, item.order
+
+            session.add_all((item, neighbour))
+            return ItemRead.from_task(item, task)
+
+    @classmethod
+    def move_to(cls, project_id: str, id: str, order: int):
+        with unit_of_work() as session:
+            project = cls.get_project(session, project_id)
+            Project.bump_version(session, project.id)
+            cls.materialize(session, project.id)
+            item, task = cls.get_task(session, project, id)
+
+            if task.status == Status.DONE:
+                return ItemRead.from_task(item, task)
+
+            cls._reorder(session, project.id, item.order, exclude=item.id, shift=False)
+
+            statement = (
+                select(func.count())
+                .select_from(Item)
+                .join(Task)
+                .where(
+                    Item.project_id == project.id,
+                    Task.status != Status.DONE,
+                    Item.id != item.id,
+                )
             )
+            item.order = min(order, session.exec(statement).one())
+
+            cls._reorder(session, project.id, item.order, exclude=item.id, shift=True)
 
             session.add(item)
-            session.commit()
-            session.refresh(item)
-            session.refresh(task)
             return ItemRead.from_task(item, task)
 
+    @classmethod
+    def set_order(cls, project_id: str, ids: list[str]):
+        with unit_of_work() as session:
+            project = cls.get_project(session, project_id)
+            Project.bump_version(session, project.id)
+            cls.materialize(session, project.id)
+
+            statement = (
+                select(Item.id)
+                .join(Task)
+                .where(
+                    Item.project_id == project.id,
+                    Task.status != Status.DONE,
+                )
+            )
+            if len(ids) != len(set(ids)) or set(ids) != set(session.exec(statement)):
+                raise ValueError("Ordering must list every unchecked item once")
+            if not ids:
+                return
+
+            statement = (
+                update(Item)
+                .where(col(Item.id).in_(ids))
+                .values(
+                    order=case({id: i for i, id in enumerate(ids)}, value=Item.id),
+                    **version_values(session),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            session.exec(statement)  # type: ignore
+
     @classmethod
     def check_or_uncheck(cls, project_id: str, id: str):
-        with Session(engine) as session:
+        with unit_of_work() as session:
             project = cls.get_project(session, project_id)
+            Project.bump_version(session, project.id)
+            cls.materialize(session, project.id)
             item, task = cls.get_task(session, project, id)
 
             if task.status == Status.DONE:
@@ -115,18 +185,15 @@ class Item(SubTaskMixin, ItemBase, TaskMixin[ItemRead], table=True):
                 item.order = 0
 
             session.add_all((task, item))
-            session.commit()
-
-            session.refresh(item)
-            session.refresh(task)
 
             cls._reorder(
-                session, project_id, original_order, item.id, original_order == 0
+                session,
+                project_id,
+                original_order,
+                item.id,
+                shift=task.status != Status.DONE,
             )
 
-            session.refresh(item)
-            session.refresh(task)
-
             return ItemRead.from_task(item, task)
 
     @classmethod
@@ -154,7 +221,6 @@ class Item(SubTaskMixin, ItemBase, TaskMixin[ItemRead], table=True):
                 exclude=current_obj.id,
                 shift=True,
             )
-        session.refresh(current_obj)
         return current_obj
 
     @classmethod
@@ -164,9 +230,11 @@ class Item(SubTaskMixin, ItemBase, TaskMixin[ItemRead], table=True):
         project: Project,
         original_obj: Self,
     ):
-        cls._reorder(
-            session, project.id, original_obj.order, original_obj.id, shift=False
-        )
+        task = session.get(Task, original_obj.id)
+        if task is not None and task.status != Status.DONE:
+            cls._reorder(
+                session, project.id, original_obj.order, original_obj.id, shift=False
+            )
         return True
 
     @classmethod
@@ -178,22 +246,24 @@ class Item(SubTaskMixin, ItemBase, TaskMixin[ItemRead], table=True):
         exclude: str,
         shift: bool = True,
     ):
+        if shift:
+            criteria, offset = Item.order >= order, 1
+        else:
+            criteria, offset = Item.order > order, -1
         statement = (
-            select(Item)
-            .join(Task)
+            update(Item)
             .where(
-                Task.id == Item.id,
-                Task.project_id == project_id,
-                Item.order >= order,
-                Task.status != Status.DONE,
-                Item.id != exclude,
+                Item.project_id == project_id,
+                col(Item.id).in_(
+                    select(Task.id).where(
+                        Task.project_id == project_id,
+                        Task.status != Status.DONE,
+                    )
+                ),
+                criteria,
+                col(Item.id) != exclude,
             )
-            .order_by(col(Item.order).asc())
+            .values(order=Item.order + offset, **version_values(session))
+            .execution_options(synchronize_session=False)
         )
-        items = session.exec(statement).all()
-        for i, item in enumerate(items):
-            item.order = order + i
-            if shift:
-                item.order += 1
-            session.add(item)
-        session.commit()
+        session.exec(statement)  # type: ignore
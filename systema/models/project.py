@@ -1,38 +1,179 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Any, ClassVar, Generator, Generic, Sequence, TypeVar
 
-from sqlmodel import Field, Session, select
+from sqlalchemy import ColumnElement
+from sqlmodel import Field, Session, col, delete, select, update
 
 from systema.base import BaseModel, IdMixin
-from systema.server.db import engine
+from systema.models.change import PROJECT_VERSION
+from systema.server.cache import ALL_PROJECTS, invalidate_on_commit, read_cache
+from systema.server.db import engine, stream_rows, unit_of_work
+from systema.server.pagination import Page, paginate, with_key_fields
 
 
 class SubProjectMixin(BaseModel):
     id: str = Field(..., foreign_key="project.id", primary_key=True)
+    materialized: bool = Field(default=True, sa_column_kwargs={"server_default": "1"})
+    """Whether every task has a row in this view, filled the first time it is used"""
+
+
+R = TypeVar("R")
+
+
+class CollectionMixin(BaseModel, Generic[R]):
+    """Rows of a project (or of every project, given `None`) in a stable order"""
+
+    @classmethod
+    def _sort_columns(cls) -> tuple[Any, ...]:
+        raise NotImplementedError()
+
+    @classmethod
+    def _select(cls, fields: Sequence[str] | None = None):
+        """Whole rows built into read models, or only `fields` built into dicts"""
+        raise NotImplementedError()
+
+    @classmethod
+    def _in_project(cls, project_id: str) -> ColumnElement[bool]:
+        raise NotImplementedError()
+
+    @classmethod
+    def _prepare_read(cls, project_id: str | None):
+        pass
+
+    @classmethod
+    def _list_statement(cls, project_id: str | None, fields: Sequence[str] | None):
+        statement, build = cls._select(fields)
+        if project_id is not None:
+            statement = statement.where(cls._in_project(project_id))
+        return statement.order_by(*cls._sort_columns()), build
+
+    @classmethod
+    def list(
+        cls,
+        project_id: str | None,
+        fields: Sequence[str] | None = None,
+        version: int | None = None,
+    ) -> Generator[R | dict[str, Any], None, None]:
+        """Rows cached per project `version`, read when not given"""
+        cls._prepare_read(project_id)
+        if version is None and project_id is not None:
+            version = Project.get_version(project_id)
+        key = (cls.__name__, fields and tuple(fields), version)
+        rows = read_cache.get_or_load(
+            project_id or ALL_PROJECTS,
+            key,
+            lambda: cls._load_list(project_id, fields),
+        )
+        return (row for row in rows)
+
+    @classmethod
+    def _load_list(cls, project_id: str | None, fields: Sequence[str] | None):
+        with Session(engine) as session:
+            statement, build = cls._list_statement(project_id, fields)
+            rows = session.exec(statement).all()
+            if not rows and project_id is not None:
+                Project.check_exists(session, project_id)
+            return [build(row) for row in rows]
+
+    @classmethod
+    def stream(
+        cls, project_id: str | None, fields: Sequence[str] | None = None
+    ) -> Generator[R | dict[str, Any], None, None]:
+        """Like `list`, but fetching rows lazily as the result is consumed"""
+        cls._prepare_read(project_id)
+        statement, build = cls._list_statement(project_id, fields)
+        if project_id is not None:
+            with Session(engine) as session:
+                Project.check_exists(session, project_id)
+        return stream_rows(statement, build)
+
+    @classmethod
+    def page(
+        cls,
+        project_id: str | None,
+        limit: int,
+        after: str | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> Page[R | dict[str, Any]]:
+        cls._prepare_read(project_id)
+        columns = cls._sort_columns()
+        if fields is not None:
+            fields = with_key_fields(fields, columns)
+        with Session(engine) as session:
+            statement, build = cls._list_statement(project_id, fields)
+            page = paginate(session, statement, columns, build, limit, after)
+            if not page.items and project_id is not None:
+                Project.check_exists(session, project_id)
+            return page
 
 
 class ProjectBase(BaseModel):
     name: str
 
 
-class Project(ProjectBase, IdMixin, table=True):
+class Project(ProjectBase, IdMixin, CollectionMixin["ProjectRead"], table=True):
     created_at: datetime = Field(default_factory=datetime.now, index=True)
+    version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    """Bumped by every write to the project or to its bins, cards and items"""
+
+    _known_ids: ClassVar[set[str]] = set()
+    """Ids of projects already seen to exist by this process"""
 
     @classmethod
-    def list(cls):
-        with Session(engine) as session:
-            statement = select(cls)
-            return (
-                ProjectRead.model_validate(row) for row in session.exec(statement).all()
-            )
+    def check_exists(cls, session: Session, id: str):
+        if id in cls._known_ids:
+            return
+        if session.exec(select(Project.id).where(Project.id == id)).first() is None:
+            raise cls.NotFound()
+        cls._known_ids.add(id)
 
     @classmethod
-    def get(cls, id: str):
+    def get_version(cls, id: str) -> int:
         with Session(engine) as session:
-            if project := session.get(cls, id):
-                return project
+            statement = select(Project.version).where(Project.id == id)
+            if (version := session.exec(statement).first()) is not None:
+                return version
+            raise cls.NotFound()
+
+    @classmethod
+    def bump_version(cls, session: Session, id: str):
+        """New version stamped on the rows the session writes, `None` if no project"""
+        statement = (
+            update(Project)
+            .where(col(Project.id) == id)
+            .values(version=Project.version + 1)
+            .returning(Project.version)
+            .execution_options(synchronize_session=False)
+        )
+        version = session.exec(statement).scalar_one_or_none()  # type: ignore
+        if version is not None:
+            session.info[PROJECT_VERSION] = (id, version)
+        invalidate_on_commit(session, id)
+        return version
+
+    @classmethod
+    def _sort_columns(cls):
+        return (col(Project.created_at), col(Project.id))
+
+    @classmethod
+    def _select(cls, fields: Sequence[str] | None = None):
+        if fields is None:
+            return select(cls), ProjectRead.from_rows
+        return ProjectRead.select_fields(fields, cls)
 
+    @classmethod
+    def get(cls, id: str, fields: Sequence[str] | None = None):
+        with Session(engine) as session:
+            if fields is None:
+                if project := session.get(cls, id):
+                    return project
+                raise cls.NotFound()
+
+            statement, build = cls._select(fields)
+            if row := session.exec(statement.where(col(cls.id) == id)).first():
+                return build(row)
             raise cls.NotFound()
 
     @classmethod
@@ -41,52 +182,59 @@ class Project(ProjectBase, IdMixin, table=True):
         from systema.models.checklist import Checklist
 
         project = Project.model_validate(data)
-        with Session(engine) as session:
+        with unit_of_work() as session:
             session.add(project)
-            session.commit()
-            session.refresh(project)
 
-            list_ = Checklist(id=project.id)
-            board = Board(id=project.id)
+            list_ = Checklist(id=project.id, materialized=False)
+            board = Board(id=project.id, materialized=False)
 
             session.add_all((list_, board))
-            session.commit()
-
-            session.refresh(board)
             board.create_default_bins(session)
+            invalidate_on_commit(session, ALL_PROJECTS)
 
-            session.refresh(project)
-            return ProjectRead.model_validate(project)
+            return ProjectRead.from_rows(project)
 
     @classmethod
     def update(cls, id: str, data: ProjectUpdate):
-        with Session(engine) as session:
+        with unit_of_work() as session:
             if db_project := session.get(Project, id):
                 db_project.sqlmodel_update(data.model_dump(exclude_unset=True))
                 session.add(db_project)
-                session.commit()
-
-                session.refresh(db_project)
-                return ProjectRead.model_validate(db_project)
+                cls.bump_version(session, id)
+                invalidate_on_commit(session, ALL_PROJECTS)
+                return ProjectRead.from_rows(db_project)
 
             raise cls.NotFound()
 
     @classmethod
     def delete(cls, id: str):
+        from systema.models.bin import Bin
         from systema.models.board import Board
+        from systema.models.card import Card
+        from systema.models.change import Tombstone
         from systema.models.checklist import Checklist
-
-        with Session(engine) as session:
-            if project := session.get(Project, id):
-                session.delete(project)
-                if list_ := session.get(Checklist, id):
-                    session.delete(list_)
-                if board := session.get(Board, id):
-                    session.delete(board)
-                session.commit()
-                return
-
-            raise cls.NotFound()
+        from systema.models.item import Item
+        from systema.models.task import Task
+
+        with unit_of_work() as session:
+            statements = (
+                delete(Item).where(col(Item.project_id) == id),
+                delete(Card).where(col(Card.project_id) == id),
+                delete(Task).where(col(Task.project_id) == id),
+                delete(Bin).where(col(Bin.board_id) == id),
+                delete(Checklist).where(col(Checklist.id) == id),
+                delete(Board).where(col(Board.id) == id),
+                delete(Tombstone).where(col(Tombstone.project_id) == id),
+            )
+            for statement in statements:
+                session.exec(statement)  # type: ignore
+
+            cls._known_ids.discard(id)
+            invalidate_on_commit(session, id)
+            invalidate_on_commit(session, ALL_PROJECTS)
+            statement = delete(Project).where(col(Project.id) == id)
+            if not session.exec(statement).rowcount:  # type: ignore
+                raise cls.NotFound()
 
 
 class ProjectCreate(ProjectBase):
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from sqlmodel import Session, or_, select, true
+
+from systema.base import BaseModel
+from systema.models.bin import Bin, BinRead
+from systema.models.card import Card, CardRead
+from systema.models.change import Tombstone
+from systema.models.item import Item, ItemRead
+from systema.models.project import Project
+from systema.models.task import Task, TaskRead
+from systema.server.db import engine
+
+
+class Deletion(BaseModel):
+    table_name: str
+    id: str
+
+
+class Changes(BaseModel):
+    version: int
+    """Project version these changes lead to, to be passed as `since` next time"""
+    tasks: list[TaskRead]
+    items: list[ItemRead]
+    cards: list[CardRead]
+    bins: list[BinRead]
+    deleted: list[Deletion]
+
+    @classmethod
+    def since(cls, project_id: str, since: int | None = None) -> Changes:
+        """Rows of the project written after version `since`, or all of them.
+
+        The version is read first, so rows written meanwhile are sent again
+        on the next call rather than missed.
+        """
+        with Session(engine) as session:
+            statement = select(Project.version).where(Project.id == project_id)
+            if (version := session.exec(statement).first()) is None:
+                raise Project.NotFound()
+
+            def newer(*models: type[Task | Item | Card | Bin | Tombstone]):
+                if since is None:
+                    return true()
+                return or_(*(model.version > since for model in models))
+
+            tasks = session.exec(
+                select(Task).where(Task.project_id == project_id, newer(Task))
+            )
+            items = session.exec(
+                select(Item, Task)
+                .join(Task)
+                .where(Item.project_id == project_id, newer(Item, Task))
+            )
+            cards = session.exec(
+                select(Card, Task)
+                .join(Task)
+                .where(Card.project_id == project_id, newer(Card, Task))
+            )
+            bins = session.exec(
+                select(Bin).where(Bin.board_id == project_id, newer(Bin))
+            )
+            deleted = []
+            if since is not None:
+                deleted = session.exec(
+                    select(Tombstone).where(
+                        Tombstone.project_id == project_id, newer(Tombstone)
+                    )
+                )
+
+            return cls.model_construct(
+                version=version,
+                tasks=[TaskRead.from_rows(task) for task in tasks],
+                items=[ItemRead.from_task(*row) for row in items],
+                cards=[CardRead.from_task(*row) for row in cards],
+                bins=[BinRead.from_bin(bin) for bin in bins],
+                deleted=[Deletion.from_rows(tombstone) for tombstone in deleted],
+            )
@@ -3,29 +3,58 @@ from __future__ import annotations
 import enum
 from abc import abstractmethod
 from datetime import datetime
-from typing import Any, Generator, Generic, Self, TypeVar
-
-from sqlmodel import Field, Session, col, select
+from itertools import groupby
+from operator import itemgetter
+from typing import (
+    Annotated,
+    Any,
+    ClassVar,
+    Iterable,
+    Literal,
+    Self,
+    Sequence,
+    TypeVar,
+)
+
+from sqlalchemy import ColumnElement, exists, literal
+from sqlmodel import (
+    Field,
+    Index,
+    Session,
+    col,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    update,
+)
 
 from systema.base import BaseModel, IdMixin
-from systema.models.project import Project
-from systema.server.db import engine
+from systema.models.change import Tombstone, VersionMixin, version_values
+from systema.models.project import CollectionMixin, Project, SubProjectMixin
+from systema.server.db import engine, unit_of_work
 
 
 class SubTaskMixin(BaseModel):
     id: str = Field(..., foreign_key="task.id", primary_key=True)
+    project_id: str = Field(..., foreign_key="project.id", nullable=True)
+    """Project of the task, nullable until `systema upgrade` fills older rows"""
 
 
 class TaskReadMixin(BaseModel):
     @classmethod
     def from_task(cls, obj: Any, task: Task):
-        return cls.model_validate(obj, update=task.model_dump())
+        return cls.from_rows(task, obj)
 
 
 T = TypeVar("T", bound=TaskReadMixin)
 
 
-class TaskMixin(BaseModel, Generic[T]):
+class TaskMixin(CollectionMixin[T]):
+    _materialized: ClassVar[set[tuple[str, str]]] = set()
+    """Tables and project ids of views already seen materialized by this process"""
+
     @staticmethod
     def get_project(session: Session, project_id: str):
         if project := session.get(Project, project_id):
@@ -37,54 +66,116 @@ class TaskMixin(BaseModel, Generic[T]):
         statement = (
             select(cls, Task)
             .join(Task)
-            .where(Task.project_id == project.id, Task.id == id)
+            .where(cls.project_id == project.id, cls.id == id)
         )
         if result := session.exec(statement).first():
             return result
         raise cls.NotFound()
 
     @classmethod
-    def list(cls, project_id: str) -> Generator[T, None, None]:
-        read_model = cls.get_read_model()
+    def is_materialized(cls, session: Session, project_id: str) -> bool:
+        if (cls.__tablename__, project_id) in TaskMixin._materialized:
+            return True
+        if view := session.get(cls.get_view_model(), project_id):
+            return view.materialized
+        raise Project.NotFound()
+
+    @classmethod
+    def materialize(cls, session: Session, project_id: str):
+        """Give every task of the project without a row in this view one"""
+        if cls.is_materialized(session, project_id):
+            return
+
+        statement = select(cls.id).where(cls.project_id == project_id).limit(1)
+        partial = session.exec(statement).first() is not None
+
+        # Stamped with the version the caller bumped
+        stamp = {name: literal(v) for name, v in version_values(session).items()}
+        values = {
+            "id": Task.id,
+            "project_id": Task.project_id,
+            "order": cls._default_order(),
+            **stamp,
+        }
+        rows = select(*values.values()).where(
+            Task.project_id == project_id,
+            ~exists().where(cls.id == Task.id),
+        )
+        session.exec(insert(cls).from_select(list(values), rows))  # type: ignore
+
+        view = session.get(cls.get_view_model(), project_id)
+        view.sqlmodel_update({"materialized": True})
+        session.add(view)
+        if partial:
+            Task.close_gaps(session, project_id, version_values(session))
+
+    @classmethod
+    def _materialize_for_read(cls, project_id: str):
+        key = (cls.__tablename__, project_id)
+        if key in TaskMixin._materialized:
+            return
         with Session(engine) as session:
-            project = cls.get_project(session, project_id)
-            statement = (
-                select(cls, Task)
-                .join(Task)
-                .join(Project)
-                .where(
-                    cls.id == Task.id,
-                    Task.project_id == Project.id,
-                    Project.id == project.id,
-                )
-                .order_by(
-                    col(cls.order).asc(),
-                    col(Task.status).asc(),
-                )
-            )
-            return (read_model.from_task(*row) for row in session.exec(statement).all())
+            materialized = cls.is_materialized(session, project_id)
+        if not materialized:
+            with unit_of_work() as session:
+                Project.bump_version(session, project_id)
+                cls.materialize(session, project_id)
+        TaskMixin._materialized.add(key)
 
     @classmethod
-    def get(cls, project_id: str, id: str):
+    def _default_order(cls) -> ColumnElement[int]:
+        """Order of materialized rows: newest task first, as if created one by one"""
+        return newest_first()
+
+    @classmethod
+    def _sort_columns(cls):
+        return (col(cls.order), col(Task.status), col(Task.id))
+
+    @classmethod
+    def _select(cls, fields: Sequence[str] | None = None):
         read_model = cls.get_read_model()
+        if fields is None:
+            return select(cls, Task).join(Task), lambda row: read_model.from_task(*row)
+        statement, build = read_model.select_fields(fields, cls, Task)
+        return statement.join(Task), build
+
+    @classmethod
+    def _in_project(cls, project_id: str):
+        return cls.project_id == project_id
+
+    @classmethod
+    def _prepare_read(cls, project_id: str | None):
+        if project_id is not None:
+            cls._materialize_for_read(project_id)
+
+    @classmethod
+    def get(cls, project_id: str, id: str, fields: Sequence[str] | None = None):
+        cls._materialize_for_read(project_id)
         with Session(engine) as session:
-            project = cls.get_project(session, project_id)
-            return read_model.from_task(*cls.get_task(session, project, id))
+            statement, build = cls._select(fields)
+            statement = statement.where(cls.project_id == project_id, cls.id == id)
+            if row := session.exec(statement).first():
+                return build(row)
+            Project.check_exists(session, project_id)
+            raise cls.NotFound()
 
     @classmethod
     def create(cls, data: TaskCreate, project_id: str):
         read_model = cls.get_read_model()
-        with Session(engine) as session:
-            task, subclass_instances = Task.create(session, data, project_id)
+        with unit_of_work() as session:
+            task, subclass_instances = Task.create(
+                session, data, project_id, shown_in=cls
+            )
             obj = next(i for i in subclass_instances if isinstance(i, cls))
-            session.refresh(obj)
             return read_model.from_task(obj, task)
 
     @classmethod
     def update(cls, project_id: str, id: str, data: TaskUpdate):
         read_model = cls.get_read_model()
-        with Session(engine) as session:
+        with unit_of_work() as session:
             project = cls.get_project(session, project_id)
+            Project.bump_version(session, project.id)
+            cls.materialize(session, project.id)
             obj, task = cls.get_task(session, project, id)
 
             original_obj = obj.model_copy()
@@ -93,31 +184,34 @@ class TaskMixin(BaseModel, Generic[T]):
             obj.sqlmodel_update(data.model_dump(exclude_unset=True))
 
             session.add_all((obj, task))
-            session.commit()
-
-            session.refresh(obj)
-            session.refresh(task)
 
             cls.post_update(session, project, original_obj, obj)
 
-            session.refresh(obj)
-            session.refresh(task)
-
             return read_model.from_task(obj, task)
 
     @classmethod
     def delete(cls, project_id: str, id: str):
-        with Session(engine) as session:
+        with unit_of_work() as session:
             project = cls.get_project(session, project_id)
+            Project.bump_version(session, project.id)
+            cls.materialize(session, project.id)
             obj, task = cls.get_task(session, project, id)
 
             original_obj = obj.model_copy()
 
             if cls.pre_delete(session, project, original_obj):
+                cls._delete_from_other_views(session, project, id)
                 session.delete(obj)
                 session.delete(task)
 
-                session.commit()
+    @classmethod
+    def _delete_from_other_views(cls, session: Session, project: Project, id: str):
+        """Delete the task's rows in the other views, closing the gaps they leave"""
+        for model in Task.get_subclass_models():
+            if model is cls or (obj := session.get(model, id)) is None:
+                continue
+            if model.pre_delete(session, project, obj.model_copy()):
+                session.delete(obj)
 
     @classmethod
     def post_update(
@@ -143,6 +237,11 @@ class TaskMixin(BaseModel, Generic[T]):
     def get_read_model() -> type[T]:
         pass
 
+    @staticmethod
+    @abstractmethod
+    def get_view_model() -> type[SubProjectMixin]:
+        pass
+
 
 class Status(enum.Enum):
     NOT_STARTED = "not_started"
@@ -155,7 +254,12 @@ class TaskBase(BaseModel):
     status: Status = Status.NOT_STARTED
 
 
-class Task(TaskBase, IdMixin, table=True):
+class Task(TaskBase, VersionMixin, IdMixin, table=True):
+    __table_args__ = (
+        Index("ix_task_project_id_id", "project_id", "id"),
+        Index("ix_task_project_id_version", "project_id", "version"),
+    )
+
     created_at: datetime = Field(default_factory=datetime.now, index=True)
     project_id: str = Field(..., foreign_key="project.id")
 
@@ -177,25 +281,284 @@ class Task(TaskBase, IdMixin, table=True):
         raise Task.NotFound()
 
     @classmethod
-    def create(cls, session: Session, data: TaskCreate, project_id: str):
-        project = cls.get_project(session, project_id)
-        db_task = Task(name=data.name, project_id=project.id)
-        session.add(db_task)
-        session.commit()
-
-        subclass_instances = cls.create_subclass_instances(session, db_task)
+    def create(
+        cls,
+        session: Session,
+        data: TaskCreate,
+        project_id: str,
+        shown_in: type[TaskMixin] | None = None,
+    ):
+        """Insert the task on top of the materialized views and of `shown_in`"""
+        if Project.bump_version(session, project_id) is None:
+            raise Project.NotFound()
+        db_task = Task(name=data.name, project_id=project_id)
+
+        # Siblings are shifted by bulk UPDATEs skipping the new rows by id, so
+        # those are only inserted by the commit's flush
+        with session.no_autoflush:
+            session.add(db_task)
+            subclass_instances = cls.create_subclass_instances(
+                session, db_task, shown_in
+            )
 
-        session.refresh(db_task)
         return db_task, subclass_instances
 
+    @staticmethod
+    def get_subclass_models() -> tuple[type[TaskMixin], ...]:
+        from systema.models.card import Card
+        from systema.models.item import Item
+
+        return (Item, Card)
+
+    @classmethod
+    def create_subclass_instances(
+        cls, session: Session, task: Task, shown_in: type[TaskMixin] | None = None
+    ):
+        instances = []
+        for model in cls.get_subclass_models():
+            if model is shown_in:
+                model.materialize(session, task.project_id)
+            elif not model.is_materialized(session, task.project_id):
+                continue
+            instances.append(model._create(session, task))
+        return tuple(instances)
+
     @classmethod
-    def create_subclass_instances(cls, session: Session, task: Task):
+    def batch(cls, project_id: str, operations: Sequence[TaskOperation]):
+        """Apply many operations in one transaction, with set-based writes"""
+        with unit_of_work() as session:
+            project = cls.get_project(session, project_id)
+            Project.bump_version(session, project.id)
+            stamp = version_values(session)
+
+            referenced = [
+                op.id for op in operations if not isinstance(op, TaskBatchCreate)
+            ]
+            statement = select(Task.id, Task.status).where(
+                Task.project_id == project.id, col(Task.id).in_(referenced)
+            )
+            batch = _Batch(project.id, dict(session.exec(statement).all()))
+            for op in operations:
+                batch.add(op)
+
+            touched_bins = cls._delete_batch(session, project.id, batch.deleted, stamp)
+            if batch.updates:
+                params = [values | stamp for values in batch.updates.values()]
+                session.exec(update(Task), params=params)  # type: ignore
+            if batch.created:
+                params = [task.model_dump() | stamp for task in batch.created]
+                session.exec(insert(Task), params=params)  # type: ignore
+            cls._place_batch(
+                session,
+                project.id,
+                batch.created,
+                touched_bins,
+                stamp,
+                batch.unchecked,
+                batch.checked,
+            )
+
+            read_tasks = {task.id: TaskRead.from_rows(task) for task in batch.created}
+            if batch.updates:
+                statement = select(Task).where(col(Task.id).in_(batch.updates))
+                for task in session.exec(statement):
+                    read_tasks[task.id] = TaskRead.from_rows(task)
+            for result in batch.results:
+                result.task = read_tasks.get(result.id)
+            return batch.results
+
+    @staticmethod
+    def _delete_batch(
+        session: Session, project_id: str, ids: list[str], stamp: dict[str, int]
+    ) -> set[str | None]:
+        """Delete tasks with their item and card, returning the bins they were in"""
         from systema.models.card import Card
         from systema.models.item import Item
 
-        item = Item._create(session, task)
-        card = Card._create(session, task)
-        return (item, card)
+        if not ids:
+            return set()
+
+        bin_ids = set(session.exec(select(Card.bin_id).where(col(Card.id).in_(ids))))
+        for model in (Item, Card, Task):
+            session.exec(delete(model).where(col(model.id).in_(ids)))  # type: ignore
+
+        tombstones = [
+            {"project_id": project_id, "table_name": table, "id": id} | stamp
+            for id in ids
+            for table in ("item", "card", "task")
+        ]
+        session.exec(insert(Tombstone), params=tombstones)  # type: ignore
+        return bin_ids
+
+    @staticmethod
+    def close_gaps(session: Session, project_id: str, stamp: dict[str, int]):
+        """Renumber the project's items and cards densely, keeping their order"""
+        from systema.models.card import Card
+
+        statement = select(Card.bin_id).where(Card.project_id == project_id)
+        bin_ids = set(session.exec(statement).all())
+        Task._place_batch(session, project_id, [], bin_ids, stamp)
+
+    @staticmethod
+    def _place_batch(
+        session: Session,
+        project_id: str,
+        created: list[Task],
+        touched_bins: set[str | None],
+        stamp: dict[str, int],
+        unchecked: Sequence[str] = (),
+        checked: Sequence[str] = (),
+    ):
+        """Put new and `unchecked` tasks on top and `checked` items at 0, densely"""
+        from systema.models.card import Card
+        from systema.models.item import Item
+
+        if Item.is_materialized(session, project_id):
+            statement = (
+                select(Item.id, Item.order)
+                .join(Task)
+                .where(
+                    Item.project_id == project_id,
+                    Task.status != Status.DONE,
+                    col(Item.id).not_in(unchecked),
+                )
+                .order_by(*Item._sort_columns())
+            )
+            item_orders = _renumber(unchecked, session.exec(statement))
+            item_orders |= dict.fromkeys(checked, 0)
+            if created:
+                new_items = [
+                    {
+                        "id": task.id,
+                        "project_id": project_id,
+                        "order": item_orders.pop(task.id, 0),
+                    }
+                    | stamp
+                    for task in created
+                ]
+                session.exec(insert(Item), params=new_items)  # type: ignore
+            _set_orders(session, Item, item_orders, stamp)
+
+        if Card.is_materialized(session, project_id):
+            statement = (
+                select(Card.id, Card.order, Card.bin_id)
+                .join(Task)
+                .where(
+                    Card.project_id == project_id,
+                    or_(
+                        col(Card.bin_id).is_(None),
+                        col(Card.bin_id).in_(touched_bins - {None}),
+                    ),
+                )
+                .order_by(col(Card.bin_id), *Card._sort_columns())
+            )
+            card_orders: dict[str, int] = {}
+            for bin_id, rows in groupby(session.exec(statement), key=itemgetter(2)):
+                offset = len(created) if bin_id is None else 0
+                card_orders |= _renumber([], rows, offset)
+            if created:
+                new_cards = [
+                    {
+                        "id": task.id,
+                        "project_id": project_id,
+                        "order": order,
+                        "bin_id": None,
+                    }
+                    | stamp
+                    for order, task in enumerate(reversed(created))
+                ]
+                session.exec(insert(Card), params=new_cards)  # type: ignore
+            _set_orders(session, Card, card_orders, stamp)
+
+
+class _Batch:
+    """Operations of a batch, sorted by kind and checked against existing ids"""
+
+    def __init__(self, project_id: str, existing: dict[str, Status]):
+        self.project_id = project_id
+        self.existing = existing
+        """Status of each existing task before the batch"""
+        self.results: list[TaskBatchResult] = []
+        self.created: list[Task] = []
+        self.updates: dict[str, dict[str, Any]] = {}
+        self.deleted: list[str] = []
+        self.statuses: dict[str, Status] = {}
+        """Status of each task created or given one, in the order last given"""
+
+    @property
+    def unchecked(self) -> list[str]:
+        """New undone tasks and done ones undone, the last one given first"""
+        return [
+            id
+            for id, status in reversed(self.statuses.items())
+            if status != Status.DONE and self._was_done(id)
+        ]
+
+    @property
+    def checked(self) -> list[str]:
+        """Existing undone tasks marked done"""
+        return [
+            id
+            for id, status in self.statuses.items()
+            if status == Status.DONE and not self._was_done(id)
+        ]
+
+    def add(self, op: TaskOperation):
+        if isinstance(op, TaskBatchCreate):
+            task = Task(name=op.name, status=op.status, project_id=self.project_id)
+            self.created.append(task)
+            self._set_status(task.id, task.status)
+            self._report(task.id, BatchStatus.CREATED)
+        elif op.id not in self.existing:
+            self._report(op.id, BatchStatus.NOT_FOUND)
+        elif isinstance(op, TaskBatchUpdate):
+            values = op.model_dump(
+                exclude_unset=True, exclude_none=True, exclude={"op"}
+            )
+            self.updates.setdefault(op.id, {}).update(values)
+            if "status" in values:
+                self._set_status(op.id, values["status"])
+            self._report(op.id, BatchStatus.UPDATED)
+        else:
+            del self.existing[op.id]
+            self.updates.pop(op.id, None)
+            self.statuses.pop(op.id, None)
+            self.deleted.append(op.id)
+            self._report(op.id, BatchStatus.DELETED)
+
+    def _was_done(self, id: str):
+        # New tasks count as done, so the undone ones surface like unchecked items
+        return self.existing.get(id, Status.DONE) == Status.DONE
+
+    def _set_status(self, id: str, status: Status):
+        self.statuses.pop(id, None)
+        self.statuses[id] = status
+
+    def _report(self, id: str, status: BatchStatus):
+        self.results.append(TaskBatchResult(id=id, status=status))
+
+
+def _set_orders(
+    session: Session, model: type, orders: dict[str, int], stamp: dict[str, int]
+):
+    if orders:
+        params = [{"id": id, "order": o} | stamp for id, o in orders.items()]
+        session.exec(update(model), params=params)  # type: ignore
+
+
+def newest_first(partition_by: Any = None) -> ColumnElement[int]:
+    """Position of each task among the others (of its partition), newest first"""
+    order_by = (col(Task.created_at).desc(), col(Task.id).desc())
+    return func.row_number().over(partition_by=partition_by, order_by=order_by) - 1
+
+
+def _renumber(first: Sequence[str], rows: Iterable[tuple], offset: int = 0):
+    """Changed dense orders of `first` on top, then of `(id, order, ...)` rows"""
+    orders = {id: order for order, id in enumerate(first, offset)}
+    for position, (id, order, *_) in enumerate(rows, offset + len(first)):
+        if position != order:
+            orders[id] = position
+    return orders
 
 
 class TaskCreate(TaskBase):
@@ -214,3 +577,35 @@ class TaskRead(TaskBase, TaskReadMixin):
 class TaskUpdate(BaseModel):
     name: str | None = None
     status: Status | None = None
+
+
+class TaskBatchCreate(TaskCreate):
+    op: Literal["create"]
+
+
+class TaskBatchUpdate(TaskUpdate):
+    op: Literal["update"]
+    id: str
+
+
+class TaskBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: str
+
+
+TaskOperation = Annotated[
+    TaskBatchCreate | TaskBatchUpdate | TaskBatchDelete, Field(discriminator="op")
+]
+
+
+class BatchStatus(enum.Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    NOT_FOUND = "not_found"
+
+
+class TaskBatchResult(BaseModel):
+    id: str
+    status: BatchStatus
+    task: TaskRead | None = None
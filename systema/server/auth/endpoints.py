@@ -17,7 +17,7 @@ router = APIRouter(tags=["auth"])
 
 
 @router.post("/token")
-async def login_for_access_token(
+def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
 ) -> Token:
     user = authenticate_user(form_data.username, form_data.password)
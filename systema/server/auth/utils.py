@@ -1,10 +1,15 @@
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
+from itertools import chain
+from threading import Lock
 from typing import Annotated
 
 import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy import event, inspect
 from sqlmodel import Session
 
 from systema.management import settings
@@ -14,6 +19,77 @@ from .models import TokenData, User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+_CHANGED_USERS = "changed_users"
+
+
+class TokenCache:
+    """LRU cache of verified tokens and the users they were issued to.
+
+    An entry expires with its token, or after `ttl` seconds so that users
+    changed by another process are eventually seen. Users changed through a
+    session of this process are forgotten as soon as it commits.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, User]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, token: str) -> User | None:
+        with self._lock:
+            if entry := self._entries.get(token):
+                expires_at, user = entry
+                if expires_at > time.time():
+                    self._entries.move_to_end(token)
+                    return user
+                del self._entries[token]
+        return None
+
+    def put(self, token: str, user: User, expires_at: float):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[token] = (min(expires_at, time.time() + self.ttl), user)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def forget_user(self, username: str):
+        with self._lock:
+            for token, (_, user) in list(self._entries.items()):
+                if user.username == username:
+                    del self._entries[token]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache(settings.token_cache_max_entries, settings.token_cache_ttl)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context):
+    for obj in chain(session.dirty, session.deleted):
+        if isinstance(obj, User):
+            # Tokens of a renamed user are cached under the name it had
+            renamed_from = inspect(obj).attrs.username.history.deleted
+            changed = session.info.setdefault(_CHANGED_USERS, set())
+            changed.update((obj.username, *renamed_from))
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_changed_users(session: Session):
+    for username in session.info.pop(_CHANGED_USERS, ()):
+        token_cache.forget_user(username)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changed_users(session: Session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop(_CHANGED_USERS, None)
+
 
 def create_superuser(username: str, password: str):
     with Session(engine) as session:
@@ -68,7 +144,10 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     return encoded_jwt
 
 
-async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]):
+def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]):
+    if user := token_cache.get(token):
+        return user
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -87,6 +166,8 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]):
     user = get_user(username=token_data.username or "")
     if user is None:
         raise credentials_exception
+    if (expires_at := payload.get("exp")) is not None:
+        token_cache.put(token, user, expires_at)
     return user
 
 
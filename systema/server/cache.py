@@ -0,0 +1,108 @@
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Hashable, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from systema.management import settings
+
+T = TypeVar("T")
+
+ALL_PROJECTS = "*"
+"""Scope of results spanning every project"""
+
+_PENDING_SCOPES = "invalidate_on_commit"
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    entries: int = 0
+    """Entries held, including expired or invalidated ones not yet evicted"""
+    max_entries: int = 0
+    ttl: float = 0.0
+
+
+class ReadCache:
+    """LRU cache of query results, grouped into invalidable scopes.
+
+    Invalidating a scope bumps its generation instead of scanning entries:
+    older entries simply stop matching and age out of the LRU. A result
+    loaded while its scope is invalidated is returned but never stored, so
+    a read racing a write cannot cache pre-commit data.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple, tuple[float, int, Any]] = OrderedDict()
+        self._generations: defaultdict[str, int] = defaultdict(int)
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_or_load(self, scope: str, key: Hashable, load: Callable[[], T]) -> T:
+        entry_key = (scope, key)
+        with self._lock:
+            generation = self._generations[scope]
+            if entry := self._entries.get(entry_key):
+                expires_at, entry_generation, value = entry
+                if entry_generation == generation and expires_at > time.monotonic():
+                    self._entries.move_to_end(entry_key)
+                    self._hits += 1
+                    return value
+            self._misses += 1
+
+        value = load()
+
+        with self._lock:
+            if self.max_entries > 0 and self._generations[scope] == generation:
+                expires_at = time.monotonic() + self.ttl
+                self._entries[entry_key] = (expires_at, generation, value)
+                self._entries.move_to_end(entry_key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, scope: str):
+        with self._lock:
+            self._generations[scope] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+    def stats(self):
+        with self._lock:
+            return CacheStats(
+                self._hits,
+                self._misses,
+                len(self._entries),
+                self.max_entries,
+                self.ttl,
+            )
+
+
+read_cache = ReadCache(settings.read_cache_max_entries, settings.read_cache_ttl)
+
+
+def invalidate_on_commit(session: Session, scope: str):
+    """Drop cached results of `scope` once the session's transaction commits"""
+    session.info.setdefault(_PENDING_SCOPES, set()).add(scope)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_pending_scopes(session: Session):
+    for scope in session.info.pop(_PENDING_SCOPES, ()):
+        read_cache.invalidate(scope)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_scopes(session: Session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop(_PENDING_SCOPES, None)
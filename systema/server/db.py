@@ -1,8 +1,74 @@
-from sqlmodel import SQLModel, create_engine
+from contextlib import contextmanager
 
-from systema.management import settings
+from sqlalchemy import Engine, event, make_url
+from sqlmodel import Session, SQLModel, create_engine
 
-engine = create_engine(settings.db_address)
+from systema.management import DBProfile, settings
+from systema.server.instrumentation import instrument
+
+SQLITE_PRAGMAS: dict[DBProfile, dict[str, str | int]] = {
+    DBProfile.SERVER: {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    DBProfile.TUI: {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 64 * 1024 * 1024,
+        "cache_size": -16 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    DBProfile.LOW_MEMORY: {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 0,
+        "cache_size": -2 * 1024,
+        "temp_store": "FILE",
+        "busy_timeout": 5000,
+    },
+}
+"""Pragmas applied to every new SQLite connection (negative cache sizes are KiB)"""
+
+SQLITE_POOL_OPTIONS: dict[DBProfile, dict[str, int]] = {
+    DBProfile.SERVER: {"pool_size": 8, "max_overflow": 8},
+    DBProfile.TUI: {"pool_size": 2, "max_overflow": 2},
+    DBProfile.LOW_MEMORY: {"pool_size": 1, "max_overflow": 1},
+}
+"""Connection pool sizing for file-backed SQLite databases"""
+
+
+def engine_factory(address: str, profile: DBProfile) -> Engine:
+    url = make_url(address)
+    if url.get_backend_name() != "sqlite":
+        return create_engine(url)
+
+    in_memory = url.database in (None, "", ":memory:")
+    engine = create_engine(
+        url,
+        **({} if in_memory else SQLITE_POOL_OPTIONS[profile]),
+    )
+    pragmas = SQLITE_PRAGMAS[profile]
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            if in_memory and name in ("journal_mode", "mmap_size"):
+                continue
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return engine
+
+
+engine = engine_factory(settings.db_address, settings.db_profile)
+if settings.db_instrumentation:
+    instrument(engine)
 
 
 def create_db_and_tables():
@@ -11,3 +77,26 @@ def create_db_and_tables():
 
 def show_tables():
     print(SQLModel.metadata.tables)
+
+
+STREAM_BATCH_SIZE = 500
+"""Rows fetched from the cursor at a time when streaming query results"""
+
+
+def stream_rows(statement, build):
+    """Yield `build(row)` for each row, fetching them as they are consumed"""
+    with Session(engine) as session:
+        statement = statement.execution_options(yield_per=STREAM_BATCH_SIZE)
+        for row in session.exec(statement):
+            yield build(row)
+
+
+@contextmanager
+def unit_of_work():
+    """Session whose changes are flushed and committed once, when the block exits.
+
+    Nothing is committed if the block raises, so a partially applied write
+    (e.g. a move that already shifted its siblings) is rolled back as a whole.
+    """
+    with Session(engine) as session, session.begin():
+        yield session
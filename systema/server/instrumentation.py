@@ -0,0 +1,85 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import Engine, event
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    queries: int = 0
+    """Statements sent to the database"""
+    rows: int = 0
+    """Rows reported by the driver (affected rows for writes)"""
+    db_time: float = 0.0
+    """Seconds spent executing statements"""
+    wall_time: float = 0.0
+    """Seconds spent inside the tracked block"""
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_stats", default=None
+)
+
+
+def instrument(engine: Engine):
+    """Count statements run on `engine` towards the block tracking them, if any"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["query_start"].pop()
+        if stats := _current_stats.get():
+            stats.queries += 1
+            stats.rows += max(cursor.rowcount, 0)
+            stats.db_time += time.perf_counter() - start
+
+
+@contextmanager
+def collect_queries():
+    """Count the statements run while the block executes into new statistics.
+
+    Statistics follow the current context, so they include statements run
+    from tasks and worker threads started inside the block, even after it ends.
+    """
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats.wall_time = time.perf_counter() - start
+        _current_stats.reset(token)
+
+
+def log_queries(label: str, stats: QueryStats):
+    logger.info(
+        "%s: %d queries, %d rows, %.3f ms in database, %.3f ms total",
+        label,
+        stats.queries,
+        stats.rows,
+        stats.db_time * 1000,
+        stats.wall_time * 1000,
+        extra={"label": label, **asdict(stats)},
+    )
+
+
+@contextmanager
+def track_queries(label: str):
+    """Collect and log the statements run while the block executes.
+
+    Statements of tasks started inside the block only count if they run
+    before it ends.
+    """
+    try:
+        with collect_queries() as stats:
+            yield stats
+    finally:
+        log_queries(label, stats)
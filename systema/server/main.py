@@ -1,15 +1,20 @@
 from contextlib import asynccontextmanager
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request
 
 from systema.__version__ import VERSION
+from systema.management import settings
 from systema.server.auth.endpoints import router as auth_router
+from systema.server.auth.utils import get_current_superuser
+from systema.server.cache import CacheStats, read_cache
 from systema.server.db import create_db_and_tables
+from systema.server.instrumentation import track_queries
 from systema.server.project_manager.endpoints.bin import router as bin_router
 from systema.server.project_manager.endpoints.card import router as card_router
 from systema.server.project_manager.endpoints.item import router as item_router
 from systema.server.project_manager.endpoints.project import router as project_router
+from systema.server.project_manager.endpoints.task import router as task_router
 
 
 @asynccontextmanager
@@ -25,6 +30,17 @@ app.include_router(project_router)
 app.include_router(item_router)
 app.include_router(bin_router)
 app.include_router(card_router)
+app.include_router(task_router)
+
+if settings.db_instrumentation:
+
+    @app.middleware("http")
+    async def add_db_stats_headers(request: Request, call_next):
+        with track_queries(f"{request.method} {request.url.path}") as stats:
+            response = await call_next(request)
+        response.headers["X-DB-Queries"] = str(stats.queries)
+        response.headers["X-DB-Time"] = f"{stats.db_time * 1000:.3f}"
+        return response
 
 
 @app.get("/")
@@ -32,6 +48,15 @@ async def read_root():
     return {"Hello": "World"}
 
 
+@app.get(
+    "/cache/stats",
+    response_model=CacheStats,
+    dependencies=[Depends(get_current_superuser)],
+)
+async def read_cache_stats():
+    return read_cache.stats()
+
+
 def serve(port: int = 8080, dev: bool = False):
     uvicorn.run(
         "systema.server.main:app",
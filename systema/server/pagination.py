@@ -0,0 +1,92 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Sequence, TypeVar
+
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import to_json
+from sqlalchemy import ColumnElement, literal, tuple_
+from sqlmodel import Session
+from sqlmodel.sql.expression import Select
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidCursor(ValueError):
+    """When a cursor was not issued for the requested collection"""
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T]
+    next_cursor: str | None
+    """Where the following page starts, `None` on the last page"""
+
+
+def encode_cursor(key: Sequence[Any]) -> str:
+    return base64.urlsafe_b64encode(to_json(list(key))).decode().rstrip("=")
+
+
+def decode_cursor(token: str, columns: Sequence[ColumnElement]) -> tuple:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (binascii.Error, ValueError):
+        raise InvalidCursor("Malformed cursor")
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise InvalidCursor("Malformed cursor")
+    try:
+        return tuple(
+            TypeAdapter(_python_type(column)).validate_python(value)
+            for column, value in zip(columns, values)
+        )
+    except ValidationError:
+        raise InvalidCursor("Malformed cursor")
+
+
+def _python_type(column: ColumnElement) -> Any:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return Any
+
+
+def with_key_fields(fields: Sequence[str], columns: Sequence[ColumnElement]):
+    """`fields` plus the ones a cursor is built from, when not already there"""
+    return [*fields, *(c.key for c in columns if c.key not in fields)]
+
+
+def paginate(
+    session: Session,
+    statement: Select,
+    columns: Sequence[ColumnElement],
+    build: Callable[[Any], T],
+    limit: int,
+    after: str | None = None,
+) -> Page[T]:
+    """Fetch the rows of `statement` that follow the `after` cursor.
+
+    `statement` must be ordered by `columns`, ascending, and these must
+    identify a row (end with its primary key). Seeking on them instead of
+    using an offset keeps every page as cheap as the first one.
+    """
+    if after is not None:
+        key = decode_cursor(after, columns)
+        bounds = (literal(value, column.type) for column, value in zip(columns, key))
+        statement = statement.where(tuple_(*columns) > tuple_(*bounds))
+
+    rows = session.exec(statement.limit(limit + 1)).all()
+    items = [build(row) for row in rows[:limit]]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        if isinstance(last, dict):
+            key = [last[column.key] for column in columns]
+        else:
+            key = [getattr(last, column.key) for column in columns]
+        next_cursor = encode_cursor(key)
+    return Page(items, next_cursor)
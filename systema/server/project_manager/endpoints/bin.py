@@ -1,7 +1,15 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, status
 
 from systema.models.bin import Bin, BinCreate, BinRead, BinUpdate
+from systema.models.card import Card
+from systema.models.project import Project
 from systema.server.auth.utils import get_current_active_user
+from systema.server.responses import (
+    ListQuery,
+    list_response,
+    serialize,
+    sparse_fields,
+)
 
 router = APIRouter(
     prefix="/projects/{project_id}/bins",
@@ -11,25 +19,46 @@ router = APIRouter(
 
 
 @router.post("/", response_model=BinRead, status_code=status.HTTP_201_CREATED)
-async def create_bin(bin: BinCreate, project_id: str):
+def create_bin(bin: BinCreate, project_id: str):
     return Bin.create(bin, project_id)
 
 
 @router.get("/", response_model=list[BinRead])
-async def list_bins(project_id: str):
-    return Bin.list(project_id)
+def list_bins(request: Request, project_id: str, query: ListQuery = Depends()):
+    version = Project.get_version(project_id)
+    return list_response(request, Bin, project_id, version, query)
 
 
 @router.get("/{id}", response_model=BinRead)
-async def get_bin(project_id: str, id: str):
-    return Bin.get(project_id, id)
+def get_bin(
+    request: Request,
+    project_id: str,
+    id: str,
+    fields: list[str] | None = Depends(sparse_fields),
+):
+    if fields is None:
+        return Bin.get(project_id, id)
+    try:
+        return serialize(request, Bin.get(project_id, id, fields))
+    except Bin.UnknownField as e:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(e))
 
 
 @router.patch("/{id}", response_model=BinRead)
-async def update_bin(project_id: str, id: str, data: BinUpdate):
+def update_bin(project_id: str, id: str, data: BinUpdate):
     return Bin.update(project_id, id, data)
 
 
+@router.put("/{id}/order", status_code=status.HTTP_204_NO_CONTENT)
+def order_bin_cards(project_id: str, id: str, ids: list[str] = Body()):
+    try:
+        Card.set_order(project_id, id, ids)
+    except Bin.NotFound:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Bin not found")
+    except ValueError as e:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(e))
+
+
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_bin(project_id: str, id: str):
+def delete_bin(project_id: str, id: str):
     Bin.delete(project_id, id)
@@ -1,7 +1,15 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 
-from systema.models.card import Card, CardCreate, CardRead, CardUpdate
+from systema.models.bin import Bin
+from systema.models.card import Card, CardCreate, CardPosition, CardRead, CardUpdate
+from systema.models.project import Project
 from systema.server.auth.utils import get_current_active_user
+from systema.server.responses import (
+    ListQuery,
+    list_response,
+    serialize,
+    sparse_fields,
+)
 
 router = APIRouter(
     prefix="/projects/{project_id}/cards",
@@ -11,25 +19,46 @@ router = APIRouter(
 
 
 @router.post("/", response_model=CardRead, status_code=status.HTTP_201_CREATED)
-async def create_card(card: CardCreate, project_id: str):
+def create_card(card: CardCreate, project_id: str):
     return Card.create(card, project_id)
 
 
 @router.get("/", response_model=list[CardRead])
-async def list_cards(project_id: str):
-    return Card.list(project_id)
+def list_cards(request: Request, project_id: str, query: ListQuery = Depends()):
+    version = Project.get_version(project_id)
+    return list_response(request, Card, project_id, version, query)
 
 
 @router.get("/{id}", response_model=CardRead)
-async def get_card(project_id: str, id: str):
-    return Card.get(project_id, id)
+def get_card(
+    request: Request,
+    project_id: str,
+    id: str,
+    fields: list[str] | None = Depends(sparse_fields),
+):
+    if fields is None:
+        return Card.get(project_id, id)
+    try:
+        return serialize(request, Card.get(project_id, id, fields))
+    except Card.UnknownField as e:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(e))
 
 
 @router.patch("/{id}", response_model=CardRead)
-async def update_card(project_id: str, id: str, data: CardUpdate):
+def update_card(project_id: str, id: str, data: CardUpdate):
     return Card.update(project_id, id, data)
 
 
+@router.patch("/{id}/position", response_model=CardRead)
+def move_card(project_id: str, id: str, position: CardPosition):
+    try:
+        return Card.move_to(project_id, id, position.bin_id, position.order)
+    except Card.NotFound:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Card not found")
+    except Bin.NotFound:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Bin not found")
+
+
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_card(project_id: str, id: str):
+def delete_card(project_id: str, id: str):
     Card.delete(project_id, id)
@@ -1,12 +1,20 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, status
 
 from systema.models.item import (
     Item,
     ItemCreate,
+    ItemPosition,
     ItemRead,
     ItemUpdate,
 )
+from systema.models.project import Project
 from systema.server.auth.utils import get_current_active_user
+from systema.server.responses import (
+    ListQuery,
+    list_response,
+    serialize,
+    sparse_fields,
+)
 
 router = APIRouter(
     prefix="/projects/{project_id}/items",
@@ -16,25 +24,52 @@ router = APIRouter(
 
 
 @router.post("/", response_model=ItemRead, status_code=status.HTTP_201_CREATED)
-async def create_item(item: ItemCreate, project_id: str):
+def create_item(item: ItemCreate, project_id: str):
     return Item.create(item, project_id)
 
 
 @router.get("/", response_model=list[ItemRead])
-async def list_items(project_id: str):
-    return Item.list(project_id)
+def list_items(request: Request, project_id: str, query: ListQuery = Depends()):
+    version = Project.get_version(project_id)
+    return list_response(request, Item, project_id, version, query)
+
+
+@router.put("/order", status_code=status.HTTP_204_NO_CONTENT)
+def order_items(project_id: str, ids: list[str] = Body()):
+    try:
+        Item.set_order(project_id, ids)
+    except ValueError as e:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(e))
 
 
 @router.get("/{id}", response_model=ItemRead)
-async def get_item(project_id: str, id: str):
-    return Item.get(project_id, id)
+def get_item(
+    request: Request,
+    project_id: str,
+    id: str,
+    fields: list[str] | None = Depends(sparse_fields),
+):
+    if fields is None:
+        return Item.get(project_id, id)
+    try:
+        return serialize(request, Item.get(project_id, id, fields))
+    except Item.UnknownField as e:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(e))
 
 
 @router.patch("/{id}", response_model=ItemRead)
-async def update_item(project_id: str, id: str, data: ItemUpdate):
+def update_item(project_id: str, id: str, data: ItemUpdate):
     return Item.update(project_id, id, data)
 
 
+@router.patch("/{id}/position", response_model=ItemRead)
+def move_item(project_id: str, id: str, position: ItemPosition):
+    try:
+        return Item.move_to(project_id, id, position.order)
+    except Item.NotFound:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Item not found")
+
+
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_item(project_id: str, id: str):
+def delete_item(project_id: str, id: str):
     Item.delete(project_id, id)
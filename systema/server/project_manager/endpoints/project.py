@@ -1,12 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 
+from systema.models.board import Board, BoardSnapshot
 from systema.models.project import (
     Project,
     ProjectCreate,
     ProjectRead,
     ProjectUpdate,
 )
+from systema.models.sync import Changes
 from systema.server.auth.utils import get_current_active_user
+from systema.server.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursor
+from systema.server.responses import (
+    StreamFormat,
+    ndjson_response,
+    not_modified,
+    page_response,
+    serialize,
+    sparse_fields,
+    version_etag,
+)
 
 router = APIRouter(
     prefix="/projects",
@@ -16,25 +28,70 @@ router = APIRouter(
 
 
 @router.post("/", response_model=ProjectRead, status_code=status.HTTP_201_CREATED)
-async def create_project(project: ProjectCreate):
+def create_project(project: ProjectCreate):
     return Project.create(project)
 
 
 @router.get("/", response_model=list[ProjectRead])
-async def list_projects():
-    return Project.list()
+def list_projects(
+    request: Request,
+    stream: StreamFormat | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = None,
+    fields: list[str] | None = Depends(sparse_fields),
+):
+    try:
+        if stream:
+            return ndjson_response(Project.stream(None, fields))
+        if limit is not None or after is not None:
+            page = Project.page(None, limit or DEFAULT_PAGE_SIZE, after, fields)
+            return page_response(request, page)
+        return serialize(request, Project.list(None, fields))
+    except (Project.UnknownField, InvalidCursor) as e:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(e))
 
 
 @router.get("/{id}", response_model=ProjectRead)
-async def get_project(id: str):
+def get_project(
+    request: Request, id: str, fields: list[str] | None = Depends(sparse_fields)
+):
+    try:
+        if fields is None:
+            return Project.get(id)
+        return serialize(request, Project.get(id, fields))
+    except Project.UnknownField as e:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(e))
+    except Project.NotFound:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Project not found")
+
+
+@router.get("/{id}/board", response_model=BoardSnapshot)
+def get_project_board(request: Request, id: str):
+    try:
+        version = Project.get_version(id)
+        etag = version_etag(version)
+        if response := not_modified(request, etag):
+            return response
+        response = serialize(request, Board.snapshot(id, version))
+    except Project.NotFound:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Project not found")
+
+    response.headers["ETag"] = etag
+    return response
+
+
+@router.get("/{id}/changes", response_model=Changes)
+def get_project_changes(
+    request: Request, id: str, since: int | None = Query(None, ge=0)
+):
     try:
-        return Project.get(id)
+        return serialize(request, Changes.since(id, since))
     except Project.NotFound:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Project not found")
 
 
 @router.patch("/{id}", response_model=ProjectRead)
-async def edit_project(id: str, project: ProjectUpdate):
+def edit_project(id: str, project: ProjectUpdate):
     try:
         return Project.update(id, project)
     except Project.NotFound:
@@ -42,7 +99,7 @@ async def edit_project(id: str, project: ProjectUpdate):
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_project(id: str):
+def delete_project(id: str):
     try:
         Project.delete(id)
     except Project.NotFound:
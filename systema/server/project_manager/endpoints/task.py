@@ -1,14 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Annotated
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, status
 from sqlmodel import Session, select
 
+from systema.models.project import Project
 from systema.models.task import (
+    BatchStatus,
     Task,
+    TaskBatchCreate,
+    TaskBatchDelete,
+    TaskBatchResult,
+    TaskBatchUpdate,
     TaskCreate,
+    TaskOperation,
     TaskRead,
     TaskUpdate,
 )
 from systema.server.auth.utils import get_current_active_user
 from systema.server.db import engine
+from systema.server.responses import serialize
+
+BATCH_MAX_SIZE = 1000
 
 router = APIRouter(
     prefix="/projects/{project_id}/tasks",
@@ -18,13 +30,29 @@ router = APIRouter(
 
 
 @router.post("/", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
-async def create_task(project_id: str, task: TaskCreate):
-    db_task, _ = Task.create(task, project_id)
-    return db_task
+def create_task(project_id: str, task: TaskCreate):
+    operation = TaskBatchCreate(op="create", **task.model_dump())
+    try:
+        (result,) = Task.batch(project_id, [operation])
+    except Project.NotFound:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Project not found")
+    return result.task
+
+
+@router.post(":batch", response_model=list[TaskBatchResult])
+def batch_tasks(
+    request: Request,
+    project_id: str,
+    operations: Annotated[list[TaskOperation], Body(max_length=BATCH_MAX_SIZE)],
+):
+    try:
+        return serialize(request, Task.batch(project_id, operations))
+    except Project.NotFound:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Project not found")
 
 
 @router.get("/", response_model=list[TaskRead])
-async def list_tasks(project_id: str):
+def list_tasks(project_id: str):
     with Session(engine) as session:
         statement = select(Task).where(Task.project_id == project_id)
         if tasks := session.exec(statement).all():
@@ -33,7 +61,7 @@ async def list_tasks(project_id: str):
 
 
 @router.get("/{id}", response_model=TaskRead)
-async def get_task(project_id: str, id: str):
+def get_task(project_id: str, id: str):
     with Session(engine) as session:
         statement = select(Task).where(Task.project_id == project_id, Task.id == id)
         if task := session.exec(statement).first():
@@ -42,24 +70,24 @@ async def get_task(project_id: str, id: str):
 
 
 @router.patch("/{id}", response_model=TaskRead)
-async def edit_task(project_id: str, id: str, task: TaskUpdate):
-    with Session(engine) as session:
-        statement = select(Task).where(Task.project_id == project_id, Task.id == id)
-        if db_task := session.exec(statement).first():
-            db_task.sqlmodel_update(task.model_dump(exclude_unset=True))
-            session.add(db_task)
-            session.commit()
-            session.refresh(db_task)
-            return db_task
+def edit_task(project_id: str, id: str, task: TaskUpdate):
+    operation = TaskBatchUpdate(
+        op="update", id=id, **task.model_dump(exclude_unset=True)
+    )
+    try:
+        (result,) = Task.batch(project_id, [operation])
+    except Project.NotFound:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Project not found")
+    if result.status == BatchStatus.NOT_FOUND:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Task not found")
+    return result.task
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_project(project_id: str, id: str):
-    with Session(engine) as session:
-        statement = select(Task).where(Task.project_id == project_id, Task.id == id)
-        if task := session.exec(statement).first():
-            session.delete(task)
-            session.commit()
-            return
+def delete_task(project_id: str, id: str):
+    try:
+        (result,) = Task.batch(project_id, [TaskBatchDelete(op="delete", id=id)])
+    except Project.NotFound:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Project not found")
+    if result.status == BatchStatus.NOT_FOUND:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Task not found")
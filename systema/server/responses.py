@@ -0,0 +1,155 @@
+import enum
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Iterable, Iterator
+
+from fastapi import Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from systema.server.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursor,
+    Page,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class StreamFormat(enum.StrEnum):
+    NDJSON = "ndjson"
+
+
+def _to_builtin(obj: Any):
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+def sparse_fields(fields: str | None = None) -> list[str] | None:
+    """Names in the comma separated `fields` query parameter.
+
+    `None` (every field) when the parameter is missing or names no field.
+    """
+    if fields is None:
+        return None
+    return [name for name in map(str.strip, fields.split(",")) if name] or None
+
+
+@dataclass
+class ListQuery:
+    """Query parameters shared by the list endpoints of project collections"""
+
+    stream: StreamFormat | None = None
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE)
+    after: str | None = None
+    fields: list[str] | None = Depends(sparse_fields)
+
+
+def serialize(request: Request, content: Any, status_code: int = 200):
+    """Encode read models built from trusted rows straight to a response.
+
+    The body is produced once, without validating it against the endpoint's
+    `response_model`. MessagePack is used when the client accepts it and
+    `msgpack` is installed; JSON goes through `orjson` when installed.
+    """
+    if not isinstance(content, (list, BaseModel, dict)):
+        content = list(content)
+
+    if msgpack is not None and MSGPACK_MEDIA_TYPE in request.headers.get("accept", ""):
+        body = msgpack.packb(content, default=_to_builtin)
+        media_type = MSGPACK_MEDIA_TYPE
+    else:
+        body = _dumps(content)
+        media_type = JSON_MEDIA_TYPE
+
+    return Response(
+        body, status_code, headers={"Vary": "Accept"}, media_type=media_type
+    )
+
+
+def page_response(request: Request, page: Page):
+    """Like `serialize`, pointing to the following page in a header"""
+    response = serialize(request, page.items)
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return response
+
+
+def version_etag(version: int) -> str:
+    return f'W/"{version}"'
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    """A 304 response when the client's copy is tagged with `etag`"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return None
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in tags or etag.removeprefix("W/") in tags:
+        return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept"})
+    return None
+
+
+def list_response(
+    request: Request, model: Any, project_id: str, version: int, query: ListQuery
+):
+    """Rows of a project collection, streamed, paged or whole as `query` asks.
+
+    `model` is the collection's table model. The response is tagged with the
+    project `version`, and is a 304 when the client's copy has that tag.
+    """
+    etag = version_etag(version)
+    if response := not_modified(request, etag):
+        return response
+
+    try:
+        if query.stream:
+            response = ndjson_response(model.stream(project_id, query.fields))
+        elif query.limit is not None or query.after is not None:
+            limit = query.limit or DEFAULT_PAGE_SIZE
+            page = model.page(project_id, limit, query.after, query.fields)
+            response = page_response(request, page)
+        else:
+            rows = model.list(project_id, query.fields, version=version)
+            response = serialize(request, rows)
+    except (model.UnknownField, InvalidCursor) as e:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(e))
+
+    response.headers["ETag"] = etag
+    return response
+
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=_to_builtin)
+    return to_json(obj)
+
+
+def _ndjson_lines(rows: Iterable[Any]) -> Iterator[bytes]:
+    for row in rows:
+        yield _dumps(row) + b"\n"
+
+
+def ndjson_response(rows: Iterable[Any]):
+    """Send `rows` as newline-delimited JSON while they are being produced"""
+    return StreamingResponse(_ndjson_lines(rows), media_type=NDJSON_MEDIA_TYPE)
@@ -1,9 +1,15 @@
+import time
+from contextlib import suppress
+
 from textual import on, work
 from textual.app import App, UnknownModeError
 from textual.binding import Binding
 from textual.reactive import var
+from textual.worker import Worker, WorkerError
 
+from systema.management import settings
 from systema.models.project import ProjectRead
+from systema.server.instrumentation import QueryStats, collect_queries, log_queries
 from systema.tui.proxy import CardProxy, ItemProxy
 from systema.tui.screens.base import ProjectScreen
 from systema.tui.screens.checklist import ChecklistScreen
@@ -42,6 +48,30 @@ class SystemaTUIApp(App):
     def on_mount(self):
         self.switch_mode("main")
 
+    async def run_action(self, action, default_namespace=None) -> bool:
+        if not settings.db_instrumentation:
+            return await super().run_action(action, default_namespace)
+        label, running = f"action {action}", set(self.workers)
+        start = time.perf_counter()
+        with collect_queries() as stats:
+            handled = await super().run_action(action, default_namespace)
+        if started := [worker for worker in self.workers if worker not in running]:
+            # Actions writing through a worker return before it runs
+            self.log_queries_when_done(label, stats, start, started)
+        else:
+            log_queries(label, stats)
+        return handled
+
+    @work
+    async def log_queries_when_done(
+        self, label: str, stats: QueryStats, start: float, workers: list[Worker]
+    ):
+        for worker in workers:
+            with suppress(WorkerError):
+                await worker.wait()
+        stats.wall_time = time.perf_counter() - start
+        log_queries(label, stats)
+
     def watch_project(self, project: ProjectRead | None):
         for mode in Mode:
             if screen := PROJECT_SCREENS.get(mode):
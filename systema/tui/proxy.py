@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from typing import Any, Generator, Generic, Literal, TypeVar
 
 from systema.models.bin import Bin, BinCreate, BinRead, BinUpdate
+from systema.models.board import Board
 from systema.models.card import Card, CardCreate, CardRead, CardUpdate
 from systema.models.item import (
     Item,
@@ -39,7 +40,7 @@ class Proxy(ABC, Generic[T]):
 
 class ProjectProxy(Proxy[ProjectRead]):
     def all(self):
-        return Project.list()
+        return Project.list(None)
 
     def create(self, data: ProjectCreate):
         return Project.create(data)
@@ -70,6 +71,12 @@ class ItemProxy(Proxy[ItemRead]):
     def move(self, id: str, up_or_down: Literal["up"] | Literal["down"]):
         return Item.move(self.project_id, id, up_or_down)
 
+    def move_to(self, id: str, order: int):
+        return Item.move_to(self.project_id, id, order)
+
+    def set_order(self, ids: list[str]):
+        Item.set_order(self.project_id, ids)
+
     def toggle(self, id: str):
         return Item.check_or_uncheck(self.project_id, id)
 
@@ -93,6 +100,9 @@ class BinProxy(Proxy[BinRead]):
     def move(self, id: str, direction: Literal["left"] | Literal["right"]):
         return Bin.move(self.board_id, id, direction)
 
+    def snapshot(self):
+        return Board.snapshot(self.board_id)
+
 
 class CardProxy(Proxy[CardRead]):
     def __init__(self, board_id: str):
@@ -116,3 +126,9 @@ class CardProxy(Proxy[CardRead]):
         direction: Literal["up"] | Literal["down"] | Literal["left"] | Literal["right"],
     ):
         return Card.move(self.board_id, id, direction)
+
+    def move_to(self, id: str, bin_id: str | None, order: int):
+        return Card.move_to(self.board_id, id, bin_id, order)
+
+    def set_order(self, bin_id: str | None, ids: list[str]):
+        Card.set_order(self.board_id, bin_id, ids)
@@ -81,15 +81,15 @@ class KanbanScreen(ProjectScreen):
             bin.remove()
 
     async def populate(self):
-        cards = list(self.proxy.all())
+        snapshot = self.bin_proxy.snapshot()
         bin = BinWidget()
         self.board.mount(bin)
-        bin.mount_all(CardWidget(c) for c in self.proxy.all() if c.bin_id is None)
+        bin.mount_all(CardWidget(c) for c in snapshot.cards)
 
-        for bin_ in self.bin_proxy.all():
+        for bin_ in snapshot.bins:
             bin = BinWidget(bin=bin_)
             self.board.mount(bin)
-            bin.mount_all(CardWidget(c) for c in cards if c.bin_id == bin_.id)
+            bin.mount_all(CardWidget(c) for c in bin_.cards)
 
     @asynccontextmanager
     async def repopulate(self):
@@ -0,0 +1,26 @@
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# The engine is built from settings on import, so point it at a scratch database
+# before anything imports systema
+os.environ["SYSTEMA_DB_ADDRESS"] = f"sqlite:///{Path(tempfile.mkdtemp()) / 'test.db'}"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    import systema.models.board  # noqa: F401
+    import systema.models.checklist  # noqa: F401
+    import systema.models.item  # noqa: F401
+    from systema.server.db import create_db_and_tables
+
+    create_db_and_tables()
+
+
+@pytest.fixture
+def project():
+    from systema.models.project import Project, ProjectCreate
+
+    return Project.create(ProjectCreate(name="test"))
@@ -0,0 +1,34 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from systema.models.item import Item
+from systema.models.task import TaskCreate
+from systema.server.auth.utils import get_current_active_user
+from systema.server.main import app
+
+
+def item_orders(project_id: str):
+    return {item.id: item.order for item in Item.list(project_id)}
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[get_current_active_user] = lambda: None
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_patching_status_reorders_items(client, project):
+    third, second, first = (
+        Item.create(TaskCreate(name=name), project.id).id for name in "abc"
+    )
+    url = f"/projects/{project.id}/tasks/{{}}"
+    assert item_orders(project.id) == {first: 0, second: 1, third: 2}
+
+    response = client.patch(url.format(second), json={"status": "done"})
+    assert response.status_code == 200
+    assert item_orders(project.id) == {first: 0, second: 0, third: 1}
+
+    response = client.patch(url.format(second), json={"status": "not_started"})
+    assert response.status_code == 200
+    assert item_orders(project.id) == {second: 0, first: 1, third: 2}
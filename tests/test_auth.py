@@ -0,0 +1,51 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from systema.server.auth.models import User
+from systema.server.auth.utils import create_superuser
+from systema.server.db import engine
+from systema.server.main import app
+
+
+@pytest.fixture
+def headers():
+    create_superuser("alice", "secret")
+    yield authenticate("alice", "secret")
+    with Session(engine) as session:
+        for username in ("alice", "alicia"):
+            if user := session.get(User, username):
+                session.delete(user)
+        session.commit()
+
+
+def authenticate(username: str, password: str):
+    data = {"username": username, "password": password}
+    token = TestClient(app).post("/token", data=data).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def change_user(**values):
+    with Session(engine) as session:
+        user = session.get(User, "alice")
+        user.sqlmodel_update(values)
+        session.add(user)
+        session.commit()
+
+
+def test_deactivated_user_is_refused(headers):
+    client = TestClient(app)
+    assert client.get("/projects/", headers=headers).status_code == 200
+
+    change_user(active=False)
+
+    assert client.get("/projects/", headers=headers).status_code == 403
+
+
+def test_renamed_user_token_is_refused(headers):
+    client = TestClient(app)
+    assert client.get("/projects/", headers=headers).status_code == 200
+
+    change_user(username="alicia")
+
+    assert client.get("/projects/", headers=headers).status_code == 401
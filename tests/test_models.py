@@ -0,0 +1,129 @@
+from sqlmodel import Session, col, delete, select
+
+from systema.models.card import Card
+from systema.models.change import Tombstone
+from systema.models.item import Item
+from systema.models.task import Status, Task, TaskBatchUpdate, TaskCreate
+from systema.server.db import engine
+
+
+def create_items(project_id: str, count: int):
+    """Ids of `count` new items, newest (topmost) first"""
+    ids = [
+        Item.create(TaskCreate(name=f"task {i}"), project_id).id for i in range(count)
+    ]
+    return ids[::-1]
+
+
+def item_orders(project_id: str):
+    return sorted(
+        (item.status == Status.DONE, item.order, item.id)
+        for item in Item.list(project_id)
+    )
+
+
+def card_orders(project_id: str):
+    return sorted((card.order, card.id) for card in Card.list(project_id))
+
+
+def test_deleting_an_item_deletes_its_card(project):
+    first, second, third = create_items(project.id, 3)
+    assert card_orders(project.id) == [(0, first), (1, second), (2, third)]
+
+    Item.delete(project.id, second)
+
+    assert card_orders(project.id) == [(0, first), (1, third)]
+    Card.set_order(project.id, None, [third, first])
+    assert card_orders(project.id) == [(0, third), (1, first)]
+
+
+def test_move_to_clamps_to_the_cards_left_after_a_delete(project):
+    first, second, third = create_items(project.id, 3)
+    Card.delete(project.id, third)
+
+    card = Card.move_to(project.id, first, None, 10)
+
+    assert card.order == 1
+    assert card_orders(project.id) == [(0, second), (1, first)]
+
+
+def test_orphans_removes_leaked_cards(project):
+    from systema.cli.migration import delete_orphans
+
+    first, second, third = create_items(project.id, 3)
+    card_orders(project.id)
+    with Session(engine) as session:
+        # What deleting an item used to leave behind
+        for model in (Item, Task):
+            session.exec(delete(model).where(col(model.id) == second))  # type: ignore
+        session.commit()
+
+    delete_orphans()
+
+    assert card_orders(project.id) == [(0, first), (1, third)]
+    with Session(engine) as session:
+        statement = select(Tombstone.id).where(
+            Tombstone.project_id == project.id, Tombstone.table_name == "card"
+        )
+        assert session.exec(statement).all() == [second]
+
+
+def test_batch_status_updates_move_items_like_check_or_uncheck(project):
+    first, second, third = create_items(project.id, 3)
+    item_orders(project.id)
+
+    done = TaskBatchUpdate(op="update", id=second, status=Status.DONE)
+    Task.batch(project.id, [done])
+
+    assert item_orders(project.id) == [
+        (False, 0, first),
+        (False, 1, third),
+        (True, 0, second),
+    ]
+
+    undone = [
+        TaskBatchUpdate(op="update", id=second, status=Status.NOT_STARTED),
+        TaskBatchUpdate(op="update", id=third, status=Status.DONE),
+    ]
+    Task.batch(project.id, undone)
+
+    assert item_orders(project.id) == [
+        (False, 0, second),
+        (False, 1, first),
+        (True, 0, third),
+    ]
+
+
+def test_migration_leaves_unused_views_to_materialize(project):
+    from systema.cli.migration import create_submodels
+
+    first, second, third = create_items(project.id, 3)
+
+    create_submodels()
+
+    assert card_orders(project.id) == [(0, first), (1, second), (2, third)]
+
+
+def test_materializing_a_partly_populated_view(project):
+    first, second, third = create_items(project.id, 3)
+    with Session(engine) as session:
+        session.add(Card(id=third, project_id=project.id, order=0))
+        session.commit()
+
+    orders = card_orders(project.id)
+
+    assert {id for _, id in orders} == {first, second, third}
+    assert [order for order, _ in orders] == [0, 1, 2]
+
+
+def test_moving_a_checked_item_leaves_the_others_alone(project):
+    first, second, third = create_items(project.id, 3)
+    Item.check_or_uncheck(project.id, first)
+
+    Item.move(project.id, first, "down")
+
+    assert item_orders(project.id) == [
+        (False, 0, second),
+        (False, 1, third),
+        (True, 0, first),
+    ]